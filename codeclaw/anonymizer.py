@@ -1,5 +1,6 @@
 """Anonymize PII in Claude Code log data."""
 
+import functools
 import hashlib
 import os
 import re
@@ -22,19 +23,11 @@ def anonymize_path(path: str, username: str, username_hash: str, home: str | Non
 
     if home is None:
         home = os.path.expanduser("~")
-    prefixes = set()
-    for base in (f"/Users/{username}", f"/home/{username}", home):
-        for subdir in ("Documents", "Downloads", "Desktop"):
-            prefixes.add(f"{base}/{subdir}/")
-        prefixes.add(f"{base}/")
 
-    # Try longest prefixes first (subdirectory matches before bare home)
-    home_patterns = sorted(prefixes, key=len, reverse=True)
-
-    for prefix in home_patterns:
+    for prefix, is_common_dir in _home_prefixes(username, home):
         if path.startswith(prefix):
             rest = path[len(prefix):]
-            if "/Documents/" in prefix or "/Downloads/" in prefix or "/Desktop/" in prefix:
+            if is_common_dir:
                 return rest
             return f"{username_hash}/{rest}"
 
@@ -44,28 +37,45 @@ def anonymize_path(path: str, username: str, username_hash: str, home: str | Non
     return path
 
 
-def anonymize_text(text: str, username: str, username_hash: str) -> str:
-    if not text or not username:
-        return text
-
-    escaped = re.escape(username)
-
-    # Replace /Users/<username> and /home/<username>
-    text = re.sub(rf"/Users/{escaped}(?=/|[^a-zA-Z0-9_-]|$)", f"/{username_hash}", text)
-    text = re.sub(rf"/home/{escaped}(?=/|[^a-zA-Z0-9_-]|$)", f"/{username_hash}", text)
+@functools.lru_cache(maxsize=32)
+def _home_prefixes(username: str, home: str) -> tuple[tuple[str, bool], ...]:
+    """Home-directory prefixes, longest first, flagged when they end in a common subdir."""
+    prefixes = set()
+    for base in (f"/Users/{username}", f"/home/{username}", home):
+        for subdir in ("Documents", "Downloads", "Desktop"):
+            prefixes.add((f"{base}/{subdir}/", True))
+        prefixes.add((f"{base}/", False))
 
-    # Catch hyphen-encoded paths: -Users-peteromalley- or -Users-peteromalley/
-    text = re.sub(rf"-Users-{escaped}(?=-|/|$)", f"-Users-{username_hash}", text)
-    text = re.sub(rf"-home-{escaped}(?=-|/|$)", f"-home-{username_hash}", text)
+    # Try longest prefixes first (subdirectory matches before bare home)
+    return tuple(sorted(prefixes, key=lambda item: len(item[0]), reverse=True))
 
-    # Catch temp paths like /private/tmp/claude-501/-Users-peteromalley/
-    text = re.sub(rf"claude-\d+/-Users-{escaped}", f"claude-XXX/-Users-{username_hash}", text)
 
+@functools.lru_cache(maxsize=32)
+def _text_patterns(username: str, username_hash: str) -> tuple[tuple[re.Pattern, str], ...]:
+    escaped = re.escape(username)
+    patterns = [
+        # Replace /Users/<username> and /home/<username>
+        (rf"/Users/{escaped}(?=/|[^a-zA-Z0-9_-]|$)", f"/{username_hash}"),
+        (rf"/home/{escaped}(?=/|[^a-zA-Z0-9_-]|$)", f"/{username_hash}"),
+        # Catch hyphen-encoded paths: -Users-peteromalley- or -Users-peteromalley/
+        (rf"-Users-{escaped}(?=-|/|$)", f"-Users-{username_hash}"),
+        (rf"-home-{escaped}(?=-|/|$)", f"-home-{username_hash}"),
+        # Catch temp paths like /private/tmp/claude-501/-Users-peteromalley/
+        (rf"claude-\d+/-Users-{escaped}", f"claude-XXX/-Users-{username_hash}"),
+    ]
     # Final pass: replace bare username in remaining contexts (ls output, prose, etc.)
     # Only if username is >= 4 chars to avoid false positives
     if len(username) >= 4:
-        text = re.sub(rf"\b{escaped}\b", username_hash, text)
+        patterns.append((rf"\b{escaped}\b", username_hash))
+    return tuple((re.compile(pattern), repl) for pattern, repl in patterns)
+
 
+def anonymize_text(text: str, username: str, username_hash: str) -> str:
+    if not text or not username:
+        return text
+
+    for pattern, repl in _text_patterns(username, username_hash):
+        text = pattern.sub(repl, text)
     return text
 
 
@@ -96,10 +106,33 @@ class Anonymizer:
             result = _replace_username(result, name, hashed)
         return result
 
+    def text_many(self, contents: list[str]) -> list[str]:
+        """Anonymize a batch of strings, resolving the compiled patterns once."""
+        if not self.username:
+            patterns: tuple[tuple[re.Pattern, str], ...] = ()
+        else:
+            patterns = _text_patterns(self.username, self.username_hash)
+        extra = [
+            (_username_pattern(name), hashed) for name, hashed in self._extra if len(name) >= 3
+        ]
+        results = []
+        append = results.append
+        for result in contents:
+            if result:
+                for pattern, repl in patterns:
+                    result = pattern.sub(repl, result)
+                for pattern, hashed in extra:
+                    result = pattern.sub(hashed, result)
+            append(result)
+        return results
+
 
 def _replace_username(text: str, username: str, username_hash: str) -> str:
     if not text or not username or len(username) < 3:
         return text
-    escaped = re.escape(username)
-    text = re.sub(escaped, username_hash, text, flags=re.IGNORECASE)
-    return text
+    return _username_pattern(username).sub(username_hash, text)
+
+
+@functools.lru_cache(maxsize=64)
+def _username_pattern(username: str) -> re.Pattern:
+    return re.compile(re.escape(username), re.IGNORECASE)
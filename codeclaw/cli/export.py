@@ -19,7 +19,7 @@ from ..storage import (
     EncryptionError,
     encryption_status,
     ensure_encryption_key,
-    is_encrypted_text,
+    is_encrypted_file,
     maybe_encrypt_file,
     read_jsonl,
     read_text,
@@ -1610,7 +1610,7 @@ def _build_pii_commands(output_path: Path) -> list[str]:
     """Return grep commands for PII scanning."""
     p = str(output_path.resolve())
     try:
-        encrypted = is_encrypted_text(read_text(output_path, config=load_config(), strict=False))
+        encrypted = is_encrypted_file(output_path)
     except OSError:
         encrypted = False
     if encrypted:
@@ -1637,7 +1637,7 @@ def _print_pii_guidance(output_path: Path) -> None:
     """Print PII review guidance with concrete grep commands."""
     abs_output = output_path.resolve()
     try:
-        encrypted = is_encrypted_text(read_text(output_path, config=load_config(), strict=False))
+        encrypted = is_encrypted_file(output_path)
     except OSError:
         encrypted = False
     print(f"\n{'=' * 50}")
@@ -88,6 +88,11 @@ DEFAULT_CONFIG: CodeClawConfig = {
 }
 
 
+def config_path() -> Path:
+    """Path of the config file, looked up per call so a redirected path is honoured."""
+    return CONFIG_FILE
+
+
 def load_config() -> CodeClawConfig:
     if CONFIG_FILE.exists():
         try:
@@ -126,13 +126,14 @@ def _append_file(src: Path, dst: Path) -> None:
     if not src.exists() or src.stat().st_size == 0:
         return
     CODECLAW_DIR.mkdir(parents=True, exist_ok=True)
-    src_text = read_text(src, config=load_config())
+    config = load_config()
+    src_text = read_text(src, config=config)
     if not src_text.strip():
         return
-    existing = read_text(dst, config=load_config()) if dst.exists() else ""
+    existing = read_text(dst, config=config) if dst.exists() else ""
     merged = existing + ("" if existing.endswith("\n") or not existing else "\n") + src_text
     write_text(dst, merged)
-    maybe_encrypt_file(dst, config=load_config())
+    maybe_encrypt_file(dst, config=config)
 
 
 def _count_jsonl(path: Path) -> int:
@@ -149,11 +150,12 @@ def _rotate_pending() -> Path | None:
         return None
     ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
     archive_file = ARCHIVE_DIR / f"{datetime.now(tz=timezone.utc):%Y%m%d}.jsonl"
-    pending_text = read_text(PENDING_FILE, config=load_config())
-    existing = read_text(archive_file, config=load_config()) if archive_file.exists() else ""
+    config = load_config()
+    pending_text = read_text(PENDING_FILE, config=config)
+    existing = read_text(archive_file, config=config) if archive_file.exists() else ""
     merged = existing + ("" if existing.endswith("\n") or not existing else "\n") + pending_text
     write_text(archive_file, merged)
-    maybe_encrypt_file(archive_file, config=load_config())
+    maybe_encrypt_file(archive_file, config=config)
     PENDING_FILE.unlink(missing_ok=True)
     return archive_file
 
@@ -406,6 +408,15 @@ def stop_daemon() -> dict[str, object]:
     return {"running": False, "stopping_pid": pid}
 
 
+def daemon_running() -> bool:
+    """Whether the watcher process is alive: the cheap part of ``daemon_status``.
+
+    Pollers that only need this avoid re-counting (and decrypting) the
+    pending queue on every probe.
+    """
+    return _read_pid() is not None
+
+
 def daemon_status() -> dict[str, object]:
     pid = _read_pid()
     config = load_config()
@@ -3,13 +3,21 @@
 import dataclasses
 import json
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from operator import itemgetter
 from pathlib import Path
 from typing import Any
 
 from .anonymizer import Anonymizer
 from .secrets import redact_text
-from .source_adapters import discover_external_projects, parse_external_project_sessions
+from .source_adapters import (
+    _STATS_PROTOTYPE,
+    _loads_json,
+    discover_external_projects,
+    parse_external_project_sessions,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -24,18 +32,56 @@ CODEX_SESSIONS_DIR = CODEX_DIR / "sessions"
 CODEX_ARCHIVED_DIR = CODEX_DIR / "archived_sessions"
 UNKNOWN_CODEX_CWD = "<unknown-cwd>"
 
+# Claude Code encodes project directories by replacing path separators with "-".
+_PATH_TRANS = str.maketrans({"\\": "-", "/": "-"})
+
 _CODEX_PROJECT_INDEX: dict[str, list[Path]] = {}
+_CODEX_INDEX_MAX_WORKERS = 16
+# Session file -> ((mtime_ns, size), cwd); files not in the latest index build are dropped.
+_CODEX_CWD_CACHE: dict[Path, tuple[tuple[int, int], str | None]] = {}
+_JSONL_SLURP_MAX_BYTES = 32 * 1024 * 1024
+
+
+def _path_sort_key(path: Path) -> str:
+    """Sort key for paths in one directory; normcase keeps Windows' case-insensitive Path order."""
+    return os.path.normcase(path.name)
 
 
 def _iter_jsonl(filepath: Path):
+    """Return parsed JSON objects from a JSONL file, skipping blank/malformed lines.
+
+    Files under ``_JSONL_SLURP_MAX_BYTES`` are read in one go and parsed into a
+    list; larger files are streamed line by line.
+    """
+    with open(filepath, "rb") as f:
+        if os.fstat(f.fileno()).st_size >= _JSONL_SLURP_MAX_BYTES:
+            return _stream_jsonl(filepath)
+        data = f.read()
+
+    entries: list[Any] = []
+    append = entries.append
+    loads = _loads_json
+    for line in data.split(b"\n"):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            append(loads(line))
+        except ValueError:
+            continue
+    return entries
+
+
+def _stream_jsonl(filepath: Path):
     """Yield parsed JSON objects from a JSONL file, skipping blank/malformed lines."""
+    loads = json.loads
     with open(filepath, encoding="utf-8", errors="replace") as f:
         for line in f:
             line = line.strip()
             if not line:
                 continue
             try:
-                yield json.loads(line)
+                yield loads(line)
             except json.JSONDecodeError:
                 continue
 
@@ -58,54 +104,69 @@ def detect_current_project(cwd: str | None = None) -> dict | None:
     cwd = cwd.rstrip("\\/")
     if not cwd:
         return None
-    normalized_cwd = cwd.replace("\\", "/")
-    dir_name = normalized_cwd.replace("/", "-")
+    dir_name = cwd.translate(_PATH_TRANS)
     candidate_names = [dir_name]
     if not dir_name.startswith("-"):
         candidate_names.append(f"-{dir_name}")
 
     for candidate in candidate_names:
-        project_path = PROJECTS_DIR / candidate
-        if not project_path.is_dir():
-            continue
-        sessions = list(project_path.glob("*.jsonl"))
-        if not sessions:
+        session_count, total_size = _scan_session_files(PROJECTS_DIR / candidate)
+        if not session_count:
             continue
         return {
             "dir_name": candidate,
             "display_name": _build_project_name(candidate),
-            "session_count": len(sessions),
-            "total_size_bytes": sum(f.stat().st_size for f in sessions),
+            "session_count": session_count,
+            "total_size_bytes": total_size,
             "source": CLAUDE_SOURCE,
         }
     return None
 
 
+def _scan_session_files(project_path: Path) -> tuple[int, int]:
+    """Count ``*.jsonl`` files in a directory and sum their sizes in one scandir pass."""
+    count = 0
+    total_size = 0
+    try:
+        with os.scandir(project_path) as entries:
+            for entry in entries:
+                if entry.name.endswith(".jsonl") and entry.is_file():
+                    count += 1
+                    total_size += entry.stat().st_size
+    except OSError:
+        return 0, 0
+    return count, total_size
+
+
 def discover_projects() -> list[dict]:
     """Discover Claude Code and Codex projects with session counts."""
     projects = _discover_claude_projects()
     projects.extend(_discover_codex_projects())
     projects.extend(discover_external_projects())
-    return sorted(projects, key=lambda p: (p["display_name"], p["source"]))
+    projects.sort(key=itemgetter("display_name", "source"))
+    return projects
 
 
 def _discover_claude_projects() -> list[dict]:
     if not PROJECTS_DIR.exists():
         return []
 
+    # Siblings in one directory: sorting by (normcased) name matches Path ordering but is cheaper.
+    project_dirs = list(PROJECTS_DIR.iterdir())
+    project_dirs.sort(key=_path_sort_key)
     projects = []
-    for project_dir in sorted(PROJECTS_DIR.iterdir()):
+    for project_dir in project_dirs:
         if not project_dir.is_dir():
             continue
-        sessions = list(project_dir.glob("*.jsonl"))
-        if not sessions:
+        session_count, total_size = _scan_session_files(project_dir)
+        if not session_count:
             continue
         projects.append(
             {
                 "dir_name": project_dir.name,
                 "display_name": _build_project_name(project_dir.name),
-                "session_count": len(sessions),
-                "total_size_bytes": sum(f.stat().st_size for f in sessions),
+                "session_count": session_count,
+                "total_size_bytes": total_size,
                 "source": CLAUDE_SOURCE,
             }
         )
@@ -177,8 +238,10 @@ def parse_project_sessions(
                     )
                 return []
 
+            session_files = list(project_path.glob("*.jsonl"))
+            session_files.sort(key=_path_sort_key)
             sessions = []
-            for session_file in sorted(project_path.glob("*.jsonl")):
+            for session_file in session_files:
                 parsed = _parse_claude_session_file(session_file, anonymizer, include_thinking)
                 if parsed and parsed["messages"]:
                     parsed["project"] = _build_project_name(project_dir_name)
@@ -237,14 +300,28 @@ def parse_project_sessions(
         return []
 
 
-def _make_stats() -> dict[str, int]:
-    return {
-        "user_messages": 0,
-        "assistant_messages": 0,
-        "tool_uses": 0,
-        "input_tokens": 0,
-        "output_tokens": 0,
-    }
+# Prototypes are copied rather than rebuilt from literals for every session file.
+_make_stats = _STATS_PROTOTYPE.copy
+
+_CLAUDE_METADATA_PROTOTYPE: dict[str, Any] = {
+    "session_id": None,
+    "cwd": None,
+    "git_branch": None,
+    "claude_version": None,
+    "model": None,
+    "start_time": None,
+    "end_time": None,
+}
+
+_CODEX_METADATA_PROTOTYPE: dict[str, Any] = {
+    "session_id": None,
+    "cwd": None,
+    "git_branch": None,
+    "model": None,
+    "start_time": None,
+    "end_time": None,
+    "model_provider": None,
+}
 
 
 def _make_session_result(
@@ -267,20 +344,14 @@ def _parse_claude_session_file(
     filepath: Path, anonymizer: Anonymizer, include_thinking: bool = True
 ) -> dict | None:
     messages: list[dict[str, Any]] = []
-    metadata = {
-        "session_id": filepath.stem,
-        "cwd": None,
-        "git_branch": None,
-        "claude_version": None,
-        "model": None,
-        "start_time": None,
-        "end_time": None,
-    }
+    metadata = _CLAUDE_METADATA_PROTOTYPE.copy()
+    metadata["session_id"] = filepath.stem
     stats = _make_stats()
 
     try:
+        process = _process_entry
         for entry in _iter_jsonl(filepath):
-            _process_entry(entry, messages, metadata, stats, anonymizer, include_thinking)
+            process(entry, messages, metadata, stats, anonymizer, include_thinking)
     except OSError:
         return None
 
@@ -294,17 +365,30 @@ def _parse_session_file(
     return _parse_claude_session_file(filepath, anonymizer, include_thinking)
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class _CodexParseState:
     messages: list[dict[str, Any]] = dataclasses.field(default_factory=list)
     metadata: dict[str, Any] = dataclasses.field(default_factory=dict)
-    stats: dict[str, int] = dataclasses.field(default_factory=_make_stats)
-    pending_tool_uses: list[dict[str, str | None]] = dataclasses.field(default_factory=list)
+    # Tool inputs hold raw arguments until the session is known to be kept.
+    pending_tool_uses: list[dict[str, Any]] = dataclasses.field(default_factory=list)
     pending_thinking: list[str] = dataclasses.field(default_factory=list)
     raw_cwd: str = UNKNOWN_CODEX_CWD
+    file_stem: str = ""
+    user_messages: int = 0
+    assistant_messages: int = 0
+    tool_uses: int = 0
     max_input_tokens: int = 0
     max_output_tokens: int = 0
 
+    def stats(self) -> dict[str, int]:
+        return {
+            "user_messages": self.user_messages,
+            "assistant_messages": self.assistant_messages,
+            "tool_uses": self.tool_uses,
+            "input_tokens": self.max_input_tokens,
+            "output_tokens": self.max_output_tokens,
+        }
+
 
 def _parse_codex_session_file(
     filepath: Path,
@@ -312,74 +396,50 @@ def _parse_codex_session_file(
     include_thinking: bool,
     target_cwd: str,
 ) -> dict | None:
-    state = _CodexParseState(
-        metadata={
-            "session_id": filepath.stem,
-            "cwd": None,
-            "git_branch": None,
-            "model": None,
-            "start_time": None,
-            "end_time": None,
-            "model_provider": None,
-        },
-    )
+    metadata = _CODEX_METADATA_PROTOTYPE.copy()
+    metadata["session_id"] = filepath.stem
+    state = _CodexParseState(file_stem=filepath.stem, metadata=metadata)
 
     try:
+        # Bind lookups once; this loop runs for every line of every session file.
+        get_handler = _CODEX_TOP_HANDLERS.get
+        normalize_timestamp = _normalize_timestamp
         for entry in _iter_jsonl(filepath):
-            timestamp = _normalize_timestamp(entry.get("timestamp"))
-            entry_type = entry.get("type")
-
-            if entry_type == "session_meta":
-                _handle_codex_session_meta(state, entry, filepath, anonymizer)
-            elif entry_type == "turn_context":
-                _handle_codex_turn_context(state, entry, anonymizer)
-            elif entry_type == "response_item":
-                _handle_codex_response_item(state, entry, anonymizer, include_thinking)
-            elif entry_type == "event_msg":
-                payload = entry.get("payload", {})
-                event_type = payload.get("type")
-                if event_type == "token_count":
-                    _handle_codex_token_count(state, payload)
-                elif event_type == "agent_reasoning" and include_thinking:
-                    thinking = payload.get("text")
-                    if isinstance(thinking, str) and thinking.strip():
-                        state.pending_thinking.append(anonymizer.text(thinking.strip()))
-                elif event_type == "user_message":
-                    _handle_codex_user_message(state, payload, timestamp, anonymizer)
-                elif event_type == "agent_message":
-                    _handle_codex_agent_message(state, payload, timestamp, anonymizer, include_thinking)
+            get = entry.get
+            handler = get_handler(get("type"))
+            if handler is None:
+                continue
+            handler(state, entry, anonymizer, include_thinking, normalize_timestamp(get("timestamp")))
     except OSError:
         return None
 
-    state.stats["input_tokens"] = state.max_input_tokens
-    state.stats["output_tokens"] = state.max_output_tokens
-
     if state.raw_cwd != target_cwd:
         return None
 
     _flush_codex_pending(state, timestamp=state.metadata["end_time"])
+    _summarize_codex_tool_inputs(state.messages, anonymizer)
 
     if state.metadata["model"] is None:
         model_provider = state.metadata.get("model_provider")
-        if isinstance(model_provider, str) and model_provider.strip():
+        if _nonempty_str(model_provider):
             state.metadata["model"] = f"{model_provider}-codex"
         else:
             state.metadata["model"] = "codex-unknown"
 
-    return _make_session_result(state.metadata, state.messages, state.stats)
+    return _make_session_result(state.metadata, state.messages, state.stats())
 
 
 def _handle_codex_session_meta(
-    state: _CodexParseState, entry: dict[str, Any], filepath: Path,
-    anonymizer: Anonymizer,
+    state: _CodexParseState, entry: dict[str, Any], anonymizer: Anonymizer,
+    include_thinking: bool, timestamp: str | None,
 ) -> None:
     payload = entry.get("payload", {})
     session_cwd = payload.get("cwd")
-    if isinstance(session_cwd, str) and session_cwd.strip():
+    if _nonempty_str(session_cwd):
         state.raw_cwd = session_cwd
         if state.metadata["cwd"] is None:
             state.metadata["cwd"] = anonymizer.path(session_cwd)
-    if state.metadata["session_id"] == filepath.stem:
+    if state.metadata["session_id"] == state.file_stem:
         state.metadata["session_id"] = payload.get("id", state.metadata["session_id"])
     if state.metadata["model_provider"] is None:
         state.metadata["model_provider"] = payload.get("model_provider")
@@ -390,44 +450,65 @@ def _handle_codex_session_meta(
 
 def _handle_codex_turn_context(
     state: _CodexParseState, entry: dict[str, Any], anonymizer: Anonymizer,
+    include_thinking: bool, timestamp: str | None,
 ) -> None:
     payload = entry.get("payload", {})
     session_cwd = payload.get("cwd")
-    if isinstance(session_cwd, str) and session_cwd.strip():
+    if _nonempty_str(session_cwd):
         state.raw_cwd = session_cwd
         if state.metadata["cwd"] is None:
             state.metadata["cwd"] = anonymizer.path(session_cwd)
     if state.metadata["model"] is None:
         model_name = payload.get("model")
-        if isinstance(model_name, str) and model_name.strip():
+        if _nonempty_str(model_name):
             state.metadata["model"] = model_name
 
 
 def _handle_codex_response_item(
     state: _CodexParseState, entry: dict[str, Any], anonymizer: Anonymizer,
-    include_thinking: bool,
+    include_thinking: bool, timestamp: str | None,
 ) -> None:
     payload = entry.get("payload", {})
     item_type = payload.get("type")
     if item_type == "function_call":
-        tool_name = payload.get("name")
-        args_data = _parse_codex_tool_arguments(payload.get("arguments"))
-        state.pending_tool_uses.append(
-            {
-                "tool": tool_name,
-                "input": _summarize_tool_input(tool_name, args_data, anonymizer),
-            }
-        )
+        state.pending_tool_uses.append({"tool": payload.get("name"), "input": payload.get("arguments")})
     elif item_type == "reasoning" and include_thinking:
+        texts = []
         for summary in payload.get("summary", []):
             if not isinstance(summary, dict):
                 continue
             text = summary.get("text")
-            if isinstance(text, str) and text.strip():
-                state.pending_thinking.append(anonymizer.text(text.strip()))
+            if _nonempty_str(text):
+                texts.append(text.strip())
+        if texts:
+            state.pending_thinking.extend(anonymizer.text_many(texts))
+
+
+def _handle_codex_event_msg(
+    state: _CodexParseState, entry: dict[str, Any], anonymizer: Anonymizer,
+    include_thinking: bool, timestamp: str | None,
+) -> None:
+    payload = entry.get("payload", {})
+    handler = _CODEX_EVENT_HANDLERS.get(payload.get("type"))
+    if handler is not None:
+        handler(state, payload, timestamp, anonymizer, include_thinking)
+
+
+def _handle_codex_agent_reasoning(
+    state: _CodexParseState, payload: dict[str, Any],
+    timestamp: str | None, anonymizer: Anonymizer, include_thinking: bool,
+) -> None:
+    if not include_thinking:
+        return
+    thinking = payload.get("text")
+    if _nonempty_str(thinking):
+        state.pending_thinking.append(anonymizer.text(thinking.strip()))
 
 
-def _handle_codex_token_count(state: _CodexParseState, payload: dict[str, Any]) -> None:
+def _handle_codex_token_count(
+    state: _CodexParseState, payload: dict[str, Any],
+    timestamp: str | None, anonymizer: Anonymizer, include_thinking: bool,
+) -> None:
     info = payload.get("info", {})
     if isinstance(info, dict):
         total_usage = info.get("total_token_usage", {})
@@ -441,11 +522,11 @@ def _handle_codex_token_count(state: _CodexParseState, payload: dict[str, Any])
 
 def _handle_codex_user_message(
     state: _CodexParseState, payload: dict[str, Any],
-    timestamp: str | None, anonymizer: Anonymizer,
+    timestamp: str | None, anonymizer: Anonymizer, include_thinking: bool,
 ) -> None:
     _flush_codex_pending(state, timestamp)
     content = payload.get("message")
-    if isinstance(content, str) and content.strip():
+    if _nonempty_str(content):
         state.messages.append(
             {
                 "role": "user",
@@ -453,7 +534,7 @@ def _handle_codex_user_message(
                 "timestamp": timestamp,
             }
         )
-        state.stats["user_messages"] += 1
+        state.user_messages += 1
         _update_time_bounds(state.metadata, timestamp)
 
 
@@ -463,7 +544,7 @@ def _handle_codex_agent_message(
 ) -> None:
     content = payload.get("message")
     msg: dict[str, Any] = {"role": "assistant"}
-    if isinstance(content, str) and content.strip():
+    if _nonempty_str(content):
         msg["content"] = anonymizer.text(content.strip())
     if state.pending_thinking and include_thinking:
         msg["thinking"] = "\n\n".join(state.pending_thinking)
@@ -473,14 +554,29 @@ def _handle_codex_agent_message(
     if len(msg) > 1:
         msg["timestamp"] = timestamp
         state.messages.append(msg)
-        state.stats["assistant_messages"] += 1
-        state.stats["tool_uses"] += len(msg.get("tool_uses", []))
+        state.assistant_messages += 1
+        state.tool_uses += len(msg.get("tool_uses", []))
         _update_time_bounds(state.metadata, timestamp)
 
     state.pending_tool_uses.clear()
     state.pending_thinking.clear()
 
 
+_CODEX_EVENT_HANDLERS: dict[str, Any] = {
+    "token_count": _handle_codex_token_count,
+    "agent_reasoning": _handle_codex_agent_reasoning,
+    "user_message": _handle_codex_user_message,
+    "agent_message": _handle_codex_agent_message,
+}
+
+_CODEX_TOP_HANDLERS: dict[str, Any] = {
+    "session_meta": _handle_codex_session_meta,
+    "turn_context": _handle_codex_turn_context,
+    "response_item": _handle_codex_response_item,
+    "event_msg": _handle_codex_event_msg,
+}
+
+
 def _flush_codex_pending(state: _CodexParseState, timestamp: str | None) -> None:
     if not state.pending_tool_uses and not state.pending_thinking:
         return
@@ -492,14 +588,21 @@ def _flush_codex_pending(state: _CodexParseState, timestamp: str | None) -> None
         msg["tool_uses"] = list(state.pending_tool_uses)
 
     state.messages.append(msg)
-    state.stats["assistant_messages"] += 1
-    state.stats["tool_uses"] += len(msg.get("tool_uses", []))
+    state.assistant_messages += 1
+    state.tool_uses += len(msg.get("tool_uses", []))
     _update_time_bounds(state.metadata, timestamp)
 
     state.pending_tool_uses.clear()
     state.pending_thinking.clear()
 
 
+def _summarize_codex_tool_inputs(messages: list[dict[str, Any]], anonymizer: Anonymizer) -> None:
+    for msg in messages:
+        for tool_use in msg.get("tool_uses", ()):
+            args_data = _parse_codex_tool_arguments(tool_use["input"])
+            tool_use["input"] = _summarize_tool_input(tool_use["tool"], args_data, anonymizer)
+
+
 def _parse_codex_tool_arguments(arguments: Any) -> Any:
     if isinstance(arguments, dict):
         return arguments
@@ -512,6 +615,16 @@ def _parse_codex_tool_arguments(arguments: Any) -> Any:
     return arguments
 
 
+def _nonempty_str(value: Any) -> str | None:
+    """Return ``value`` if it is a string with non-whitespace content, else ``None``.
+
+    Unlike ``value.strip()`` this does not allocate a new string just to test it.
+    """
+    if type(value) is str and value and not value.isspace():
+        return value
+    return None
+
+
 def _update_time_bounds(metadata: dict[str, Any], timestamp: str | None) -> None:
     if timestamp is None:
         return
@@ -535,27 +648,57 @@ def _get_codex_project_index(refresh: bool = False) -> dict[str, list[Path]]:
 
 def _build_codex_project_index() -> dict[str, list[Path]]:
     index: dict[str, list[Path]] = {}
-    for session_file in _iter_codex_session_files():
-        cwd = _extract_codex_cwd(session_file) or UNKNOWN_CODEX_CWD
-        index.setdefault(cwd, []).append(session_file)
+    session_files = _iter_codex_session_files()
+    cache = _CODEX_CWD_CACHE
+    cwds: dict[Path, str | None] = {}
+    misses: list[tuple[Path, tuple[int, int]]] = []
+    for session_file in session_files:
+        try:
+            stat = session_file.stat()
+        except OSError:
+            cwds[session_file] = None
+            continue
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        cached = cache.get(session_file)
+        if cached is not None and cached[0] == stamp:
+            cwds[session_file] = cached[1]
+        else:
+            misses.append((session_file, stamp))
+    if misses:
+        # Reading the cwd is I/O bound, so overlap the per-file opens of new or changed files.
+        workers = min(_CODEX_INDEX_MAX_WORKERS, len(misses))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="codeclaw-codex-index") as executor:
+            found = executor.map(_extract_codex_cwd, [session_file for session_file, _stamp in misses])
+            for (session_file, stamp), cwd in zip(misses, found):
+                cache[session_file] = (stamp, cwd)
+                cwds[session_file] = cwd
+    for stale in cache.keys() - cwds.keys():
+        del cache[stale]
+    for session_file in session_files:
+        index.setdefault(cwds[session_file] or UNKNOWN_CODEX_CWD, []).append(session_file)
     return index
 
 
 def _iter_codex_session_files() -> list[Path]:
     files: list[Path] = []
     if CODEX_SESSIONS_DIR.exists():
-        files.extend(sorted(CODEX_SESSIONS_DIR.rglob("*.jsonl")))
+        # Nested date directories: keep full Path ordering here.
+        files = list(CODEX_SESSIONS_DIR.rglob("*.jsonl"))
+        files.sort()
     if CODEX_ARCHIVED_DIR.exists():
-        files.extend(sorted(CODEX_ARCHIVED_DIR.glob("*.jsonl")))
+        archived = list(CODEX_ARCHIVED_DIR.glob("*.jsonl"))
+        archived.sort(key=_path_sort_key)
+        files.extend(archived)
     return files
 
 
 def _extract_codex_cwd(session_file: Path) -> str | None:
     try:
-        for entry in _iter_jsonl(session_file):
+        # Stream: the cwd is near the top, so don't read the whole file.
+        for entry in _stream_jsonl(session_file):
             if entry.get("type") in ("session_meta", "turn_context"):
                 cwd = entry.get("payload", {}).get("cwd")
-                if isinstance(cwd, str) and cwd.strip():
+                if _nonempty_str(cwd):
                     return cwd
     except OSError:
         return None
@@ -576,15 +719,16 @@ def _process_entry(
     anonymizer: Anonymizer,
     include_thinking: bool,
 ) -> None:
-    entry_type = entry.get("type")
+    get = entry.get
+    entry_type = get("type")
 
-    if metadata["cwd"] is None and entry.get("cwd"):
+    if metadata["cwd"] is None and get("cwd"):
         metadata["cwd"] = anonymizer.path(entry["cwd"])
-        metadata["git_branch"] = entry.get("gitBranch")
-        metadata["claude_version"] = entry.get("version")
-        metadata["session_id"] = entry.get("sessionId", metadata["session_id"])
+        metadata["git_branch"] = get("gitBranch")
+        metadata["claude_version"] = get("version")
+        metadata["session_id"] = get("sessionId", metadata["session_id"])
 
-    timestamp = _normalize_timestamp(entry.get("timestamp"))
+    timestamp = _normalize_timestamp(get("timestamp"))
 
     if entry_type == "user":
         content = _extract_user_content(entry, anonymizer)
@@ -596,9 +740,10 @@ def _process_entry(
     elif entry_type == "assistant":
         msg = _extract_assistant_content(entry, anonymizer, include_thinking)
         if msg:
+            message = get("message", {})
             if metadata["model"] is None:
-                metadata["model"] = entry.get("message", {}).get("model")
-            usage = entry.get("message", {}).get("usage", {})
+                metadata["model"] = message.get("model")
+            usage = message.get("usage", {})
             stats["input_tokens"] += usage.get("input_tokens", 0) + usage.get("cache_read_input_tokens", 0)
             stats["output_tokens"] += usage.get("output_tokens", 0)
             stats["tool_uses"] += len(msg.get("tool_uses", []))
@@ -612,7 +757,13 @@ def _extract_user_content(entry: dict[str, Any], anonymizer: Anonymizer) -> str
     msg_data = entry.get("message", {})
     content = msg_data.get("content", "")
     if isinstance(content, list):
-        text_parts = [b.get("text", "") for b in content if b.get("type") == "text"]
+        text_parts = []
+        append = text_parts.append
+        for block in content:
+            if type(block) is dict and block.get("type") == "text":
+                text = block.get("text")
+                if text:
+                    append(text)
         content = "\n".join(text_parts)
     if not content or not content.strip():
         return None
@@ -624,29 +775,34 @@ def _extract_assistant_content(
 ) -> dict[str, Any] | None:
     msg_data = entry.get("message", {})
     content_blocks = msg_data.get("content", [])
-    if not isinstance(content_blocks, list):
+    if not content_blocks or not isinstance(content_blocks, list):
         return None
 
-    text_parts = []
-    thinking_parts = []
-    tool_uses = []
+    text_parts: list[str] = []
+    thinking_parts: list[str] = []
+    tool_uses: list[dict[str, Any]] = []
+    add_text = text_parts.append
+    add_thinking = thinking_parts.append
+    add_tool_use = tool_uses.append
 
     for block in content_blocks:
         if not isinstance(block, dict):
             continue
-        block_type = block.get("type")
+        get = block.get
+        block_type = get("type")
         if block_type == "text":
-            text = block.get("text", "").strip()
+            text = get("text", "").strip()
             if text:
-                text_parts.append(anonymizer.text(text))
+                add_text(text)
         elif block_type == "thinking" and include_thinking:
-            thinking = block.get("thinking", "").strip()
+            thinking = get("thinking", "").strip()
             if thinking:
-                thinking_parts.append(anonymizer.text(thinking))
+                add_thinking(thinking)
         elif block_type == "tool_use":
-            tool_uses.append({
-                "tool": block.get("name"),
-                "input": _summarize_tool_input(block.get("name"), block.get("input", {}), anonymizer),
+            name = get("name")
+            add_tool_use({
+                "tool": name,
+                "input": _summarize_tool_input(name, get("input", {}), anonymizer),
             })
 
     if not text_parts and not tool_uses and not thinking_parts:
@@ -654,19 +810,27 @@ def _extract_assistant_content(
 
     msg = {"role": "assistant"}
     if text_parts:
-        msg["content"] = "\n\n".join(text_parts)
+        msg["content"] = "\n\n".join(anonymizer.text_many(text_parts))
     if thinking_parts:
-        msg["thinking"] = "\n\n".join(thinking_parts)
+        msg["thinking"] = "\n\n".join(anonymizer.text_many(thinking_parts))
     if tool_uses:
         msg["tool_uses"] = tool_uses
     return msg
 
 
 MAX_TOOL_INPUT_LENGTH = 300
+# Secrets are scanned in a window larger than the kept prefix so matches that
+# start near the cut-off are still seen whole.
+_REDACT_SCAN_WINDOW = MAX_TOOL_INPUT_LENGTH * 4
 
 
 def _redact_and_truncate(text: str, anonymizer: Anonymizer) -> str:
     """Redact secrets BEFORE truncating to avoid partial secret leaks."""
+    if len(text) > _REDACT_SCAN_WINDOW:
+        window = text[:_REDACT_SCAN_WINDOW]
+        # PEM blocks can be longer than the window; only match them on the full text.
+        if "-----BEGIN" not in window:
+            text = window
     text, _ = redact_text(text)
     return anonymizer.text(text[:MAX_TOOL_INPUT_LENGTH])
 
@@ -703,6 +867,10 @@ _TOOL_SUMMARIZERS: dict[str, Any] = {
     "websearch": lambda d, _: d.get("query", ""),
     "webfetch": lambda d, _: d.get("url", ""),
 }
+# Claude Code emits these exact spellings; resolving them directly skips .lower().
+for _tool_name in ("Read", "Edit", "Write", "Bash", "Grep", "Glob", "Task", "WebSearch", "WebFetch"):
+    _TOOL_SUMMARIZERS[_tool_name] = _TOOL_SUMMARIZERS[_tool_name.lower()]
+del _tool_name
 
 
 def _summarize_tool_input(tool_name: str | None, input_data: Any, anonymizer: Anonymizer) -> str:
@@ -710,23 +878,33 @@ def _summarize_tool_input(tool_name: str | None, input_data: Any, anonymizer: An
     if not isinstance(input_data, dict):
         return _redact_and_truncate(str(input_data), anonymizer)
 
-    name = tool_name.lower() if tool_name else ""
-    summarizer = _TOOL_SUMMARIZERS.get(name)
+    summarizer = _TOOL_SUMMARIZERS.get(tool_name)
+    if summarizer is None and tool_name:
+        summarizer = _TOOL_SUMMARIZERS.get(tool_name.lower())
     if summarizer is not None:
         return summarizer(input_data, anonymizer)
     return _redact_and_truncate(str(input_data), anonymizer)
 
 
+_fromtimestamp = datetime.fromtimestamp
+_UTC = timezone.utc
+
+
 def _normalize_timestamp(value) -> str | None:
-    if value is None:
-        return None
+    # ISO strings are by far the common case; test for them before anything else.
     if isinstance(value, str):
         return value
+    if value is None:
+        return None
     if isinstance(value, (int, float)):
-        return datetime.fromtimestamp(value / 1000, tz=timezone.utc).isoformat()
+        return _fromtimestamp(value / 1000, tz=_UTC).isoformat()
     return None
 
 
+_HOME_ROOTS = frozenset(("users", "home"))
+_COMMON_HOME_DIRS = frozenset(("Documents", "Downloads", "Desktop"))
+
+
 def _build_project_name(dir_name: str) -> str:
     """Convert a hyphen-encoded project dir name to a human-readable name.
 
@@ -737,14 +915,12 @@ def _build_project_name(dir_name: str) -> str:
     if dir_name == "":
         return ""
 
-    segments = [segment for segment in dir_name.strip("-").split("-") if segment]
+    segments = list(filter(None, dir_name.strip("-").split("-")))
     if not segments:
         return "unknown"
 
-    common_dirs = {"Documents", "Downloads", "Desktop"}
-
     start_idx = 0
-    if segments and segments[0].endswith(":"):
+    if segments[0].endswith(":"):
         start_idx = 1
     elif (
         len(segments) > 1
@@ -755,31 +931,19 @@ def _build_project_name(dir_name: str) -> str:
         # Some Windows Claude folder names drop the ":" from drive letters (for example "C-Users-...").
         start_idx = 1
 
-    def _join_from(index: int) -> str:
-        if index >= len(segments):
-            return "unknown"
-        return "-".join(segments[index:]) or "unknown"
-
-    if len(segments) > start_idx and segments[start_idx].lower() == "users":
-        user_idx = start_idx + 1
-        if len(segments) <= user_idx:
-            return "~home"
-        project_idx = user_idx + 1
-        if len(segments) > project_idx and segments[project_idx] in common_dirs:
-            project_idx += 1
-            if len(segments) == project_idx:
-                return f"~{segments[project_idx - 1]}"
-        if len(segments) <= project_idx:
-            return "~home"
-        return _join_from(project_idx)
-
-    if len(segments) > start_idx and segments[start_idx].lower() == "home":
-        user_idx = start_idx + 1
-        if len(segments) <= user_idx:
-            return "~home"
-        project_idx = user_idx + 1
-        if len(segments) <= project_idx:
-            return "~home"
-        return _join_from(project_idx)
-
-    return _join_from(start_idx)
+    if len(segments) <= start_idx:
+        return "unknown"
+
+    root = segments[start_idx].lower()
+    if root not in _HOME_ROOTS:
+        return "-".join(segments[start_idx:])
+
+    # <root>/<user>/[<common dir>/]<project...>
+    project_idx = start_idx + 2
+    if len(segments) <= project_idx:
+        return "~home"
+    if root == "users" and segments[project_idx] in _COMMON_HOME_DIRS:
+        project_idx += 1
+        if len(segments) == project_idx:
+            return f"~{segments[project_idx - 1]}"
+    return "-".join(segments[project_idx:])
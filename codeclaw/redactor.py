@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
-import copy
+import functools
+import multiprocessing
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from typing import Any
 
@@ -23,7 +26,7 @@ __all__ = [
 ]
 
 
-@dataclass
+@dataclass(slots=True)
 class RedactionFinding:
     source: str  # "regex" | "ml"
     category: str
@@ -45,12 +48,14 @@ class RedactionEngine:
         self.engine = engine
         self.model_size = model_size
         self.confidence_threshold = confidence_threshold
-        self._ml_ready = False
+        # None until the ML backend is first needed: loading Presidio (and its
+        # spaCy model) takes seconds, which regex-only callers never pay.
+        self._ml_ready: bool | None = None
         self._analyzer = None
-        self._init_ml_backend()
 
     def _init_ml_backend(self) -> None:
         if self.engine == "regex":
+            self._ml_ready = False
             return
         try:
             from presidio_analyzer import AnalyzerEngine
@@ -67,7 +72,9 @@ class RedactionEngine:
 
     @property
     def ml_available(self) -> bool:
-        return self._ml_ready and self._analyzer is not None
+        if self._ml_ready is None:
+            self._init_ml_backend()
+        return bool(self._ml_ready) and self._analyzer is not None
 
     def scan(self, text: str) -> list[RedactionFinding]:
         findings: list[RedactionFinding] = []
@@ -125,20 +132,41 @@ class RedactionEngine:
         return findings
 
     def redact_text(self, text: str, custom_strings: list[str] | None = None) -> tuple[str, int, list[RedactionFinding]]:
+        redacted, baseline, custom_count, ml_applied, findings = self._redact_text_counts(text, custom_strings)
+        return redacted, baseline + custom_count + ml_applied, findings
+
+    def _redact_text_counts(
+        self, text: str, custom_strings: list[str] | None = None,
+    ) -> tuple[str, int, int, int, list[RedactionFinding]]:
+        """Like ``redact_text`` but with regex, custom and ML counts kept apart."""
         findings = self.scan(text)
         redacted, baseline = redact_text(text)
         custom_count = 0
         if custom_strings:
             redacted, custom_count = redact_custom_strings(redacted, custom_strings)
 
-        ml_applied = 0
-        for finding in findings:
-            if finding.source != "ml":
-                continue
-            if finding.text and finding.text in redacted:
-                redacted = redacted.replace(finding.text, "[REDACTED:ML_PII]")
-                ml_applied += 1
-        return redacted, baseline + custom_count + ml_applied, findings
+        ml_texts = [finding.text for finding in findings if finding.source == "ml" and finding.text]
+        redacted, ml_applied = _redact_ml_texts(redacted, ml_texts)
+        return redacted, baseline, custom_count, ml_applied, findings
+
+
+def _redact_ml_texts(text: str, snippets: list[str]) -> tuple[str, int]:
+    """Replace every occurrence of the ML-detected ``snippets`` in one regex pass.
+
+    Returns the new text and how many distinct snippets were found in it.
+    Longer snippets win where two overlap.
+    """
+    if not snippets:
+        return text, 0
+    unique = sorted(set(snippets), key=len, reverse=True)
+    pattern = re.compile("|".join(map(re.escape, unique)))
+    applied: set[str] = set()
+
+    def _replace(match: re.Match) -> str:
+        applied.add(match.group(0))
+        return "[REDACTED:ML_PII]"
+
+    return pattern.sub(_replace, text), len(applied)
 
 
 def _dedupe_findings(findings: list[RedactionFinding]) -> list[RedactionFinding]:
@@ -169,21 +197,40 @@ def _iter_text_fields(session: dict[str, Any]) -> list[tuple[str, str]]:
     return fields
 
 
+def _copy_for_redaction(session: dict[str, Any]) -> dict[str, Any]:
+    """Copy the containers ``redact_session`` rewrites; other values are shared.
+
+    Only message dicts and their tool-use dicts get new text assigned, so a
+    full ``deepcopy`` of every nested value is unnecessary.
+    """
+    copied = dict(session)
+    if "messages" in session:
+        messages = []
+        for message in session["messages"]:
+            message = dict(message)
+            if message.get("tool_uses"):
+                message["tool_uses"] = [dict(tool_use) for tool_use in message["tool_uses"]]
+            messages.append(message)
+        copied["messages"] = messages
+    return copied
+
+
 def redact_session_with_findings(
     session: dict[str, Any],
     custom_strings: list[str] | None = None,
     engine: RedactionEngine | None = None,
 ) -> tuple[dict[str, Any], int, list[dict[str, Any]]]:
     """Redact a session and return merged scan findings for review UX."""
-    redacted_session, base_count = redact_session(copy.deepcopy(session), custom_strings=custom_strings)
+    redacted_session, base_count = redact_session(_copy_for_redaction(session), custom_strings=custom_strings)
     if engine is None:
         return redacted_session, base_count, []
 
     merged_findings: list[dict[str, Any]] = []
     extra_count = 0
     for field_path, text in _iter_text_fields(session):
-        _, count, findings = engine.redact_text(text, custom_strings=custom_strings)
-        extra_count += max(0, count - len(scan_text(text)))
+        # Regex and custom-string hits are already in base_count; only ML adds to it.
+        _, _, _, ml_applied, findings = engine._redact_text_counts(text, custom_strings=custom_strings)
+        extra_count += ml_applied
         for finding in findings:
             merged_findings.append(
                 {
@@ -197,31 +244,85 @@ def redact_session_with_findings(
     return redacted_session, base_count + extra_count, merged_findings
 
 
+# Below this many sessions the cost of starting worker processes outweighs
+# spreading the regex work across cores.
+_PARALLEL_REDACT_MIN_SESSIONS = 64
+_PARALLEL_REDACT_CHUNKSIZE = 8
+
+
+def _redact_one(session: dict, custom_strings: list[str] | None = None) -> tuple[dict, int]:
+    redacted_session, count, _ = redact_session_with_findings(session, custom_strings=custom_strings)
+    return redacted_session, count
+
+
+def _redact_in_processes(sessions: list[dict], custom_strings: list[str] | None) -> list[tuple[dict, int]] | None:
+    workers = min(os.cpu_count() or 1, len(sessions) // _PARALLEL_REDACT_CHUNKSIZE)
+    if workers < 2:
+        return None
+    try:
+        # Never fork: the parent may be running other threads (TUI jobs, log
+        # listener) and a child forked while one of them holds a lock, such
+        # as the secrets result cache's, would deadlock on it.
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            return list(executor.map(
+                functools.partial(_redact_one, custom_strings=custom_strings),
+                sessions,
+                chunksize=_PARALLEL_REDACT_CHUNKSIZE,
+            ))
+    except (OSError, RuntimeError):
+        # No usable process pool (sandboxed or frozen interpreter, broken
+        # worker); redact in this process instead.
+        return None
+
+
 def redact_all_sessions(
     sessions: list[dict],
     custom_strings: list[str] | None = None,
     engine: RedactionEngine | None = None,
 ) -> tuple[list[dict], int]:
-    """Redact secrets from a list of sessions."""
+    """Redact secrets from a list of sessions.
+
+    Large batches without an ML engine are redacted in a process pool; the
+    ML analyzer is expensive to ship to workers, so it always runs here.
+    """
+    results = None
+    if engine is None and len(sessions) >= _PARALLEL_REDACT_MIN_SESSIONS:
+        results = _redact_in_processes(sessions, custom_strings)
+    if results is None:
+        results = []
+        for session in sessions:
+            session, count, _ = redact_session_with_findings(
+                session,
+                custom_strings=custom_strings,
+                engine=engine,
+            )
+            results.append((session, count))
+
     total_redactions = 0
     redacted = []
-    for session in sessions:
-        session, count, _ = redact_session_with_findings(
-            session,
-            custom_strings=custom_strings,
-            engine=engine,
-        )
+    for session, count in results:
         total_redactions += count
         redacted.append(session)
     return redacted, total_redactions
 
 
+@functools.lru_cache(maxsize=1024)
+def _escape_ci(literal: str) -> re.Pattern:
+    return re.compile(re.escape(literal), re.IGNORECASE)
+
+
 def extract_context_snippets(text: str, finding_text: str, window: int = 60) -> list[str]:
     """Return compact snippets around matches for diff/review UX."""
     if not text or not finding_text:
         return []
+    # re.IGNORECASE folds a few non-ASCII letters (e.g. "ſ" and "s") that
+    # str.lower() keeps apart, so the cheap miss check is ASCII-only.
+    if text.isascii() and finding_text.isascii() and finding_text.lower() not in text.lower():
+        return []
     snippets: list[str] = []
-    for match in re.finditer(re.escape(finding_text), text, re.IGNORECASE):
+    for match in _escape_ci(finding_text).finditer(text):
         start = max(0, match.start() - window)
         end = min(len(text), match.end() + window)
         snippets.append(text[start:end].replace("\n", " "))
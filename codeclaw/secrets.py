@@ -1,20 +1,40 @@
 """Detect and redact secrets in conversation data."""
 
+import bisect
+import functools
+import hashlib
 import math
 import re
+import sys
+import threading
+from collections import Counter, OrderedDict
+from operator import itemgetter
+from typing import Any, Iterable
 
 REDACTED = "[REDACTED]"
 
+# Atomic groups (Python 3.11+) keep the engine from backtracking into a run
+# that must be followed by a character outside its class, where giving chars
+# back can never produce a match. Older interpreters get a plain group.
+_ATOMIC_OPEN = "(?>" if sys.version_info >= (3, 11) else "(?:"
+
+
+def _atomic(body: str) -> str:
+    return f"{_ATOMIC_OPEN}{body})"
+
+
 # Ordered from most specific to least specific
 SECRET_PATTERNS = [
     # JWT tokens — full 3-segment form
-    ("jwt", re.compile(r"eyJ[A-Za-z0-9_-]{20,}\.[A-Za-z0-9_-]{20,}\.[A-Za-z0-9_-]{10,}")),
+    ("jwt", re.compile(
+        r"eyJ" + _atomic(r"[A-Za-z0-9_-]{20,}") + r"\." + _atomic(r"[A-Za-z0-9_-]{20,}") + r"\.[A-Za-z0-9_-]{10,}"
+    )),
 
     # JWT tokens — partial (header only or header+partial payload, e.g. truncated)
     ("jwt_partial", re.compile(r"eyJ[A-Za-z0-9_-]{15,}")),
 
     # PostgreSQL/database connection strings with passwords
-    ("db_url", re.compile(r"postgres(?:ql)?://[^:]+:[^@\s]+@[^\s\"'`]+")),
+    ("db_url", re.compile(r"postgres(?:ql)?://" + _atomic(r"[^:]+") + ":" + _atomic(r"[^@\s]+") + r"@[^\s\"'`]+")),
 
     # Anthropic API keys
     ("anthropic_key", re.compile(r"sk-ant-[A-Za-z0-9_-]{20,}")),
@@ -77,13 +97,16 @@ SECRET_PATTERNS = [
     ("generic_secret", re.compile(
         r"""(?:secret[_-]?key|api[_-]?key|api[_-]?secret|access[_-]?token|auth[_-]?token"""
         r"""|service[_-]?role[_-]?key|private[_-]?key)"""
-        r"""\s*[=:]\s*['"]([A-Za-z0-9_/+=.-]{20,})['"]""",
+        r"""\s*[=:]\s*['"]("""
+        + _atomic(r"[A-Za-z0-9_/+=.-]{20,}")
+        + r""")['"]""",
         re.IGNORECASE,
     )),
 
     # Bearer tokens in headers
     ("bearer", re.compile(
-        r"Bearer\s+(eyJ[A-Za-z0-9_-]{20,}\.[A-Za-z0-9_-]{20,}\.[A-Za-z0-9_-]{20,})"
+        r"Bearer\s+(eyJ" + _atomic(r"[A-Za-z0-9_-]{20,}") + r"\." + _atomic(r"[A-Za-z0-9_-]{20,}")
+        + r"\.[A-Za-z0-9_-]{20,})"
     )),
 
     # IP addresses (public, non-loopback, non-private-by-default)
@@ -101,12 +124,62 @@ SECRET_PATTERNS = [
     )),
 
     # Email addresses (for PII removal) — require at least 2-char local part
-    ("email", re.compile(r"\b[A-Za-z0-9._%+-]{2,}@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b")),
+    ("email", re.compile(r"\b" + _atomic(r"[A-Za-z0-9._%+-]{2,}") + r"@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b")),
 
     # Long base64-like strings in quotes (checked for entropy — see scan_text)
-    ("high_entropy", re.compile(r"""['"][A-Za-z0-9_/+=.-]{40,}['"]""")),
+    ("high_entropy", re.compile(r"""['"]""" + _atomic(r"[A-Za-z0-9_/+=.-]{40,}") + r"""['"]""")),
 ]
 
+
+# Substrings at least one of which occurs in every match of every pattern
+# above. Text holding none of them cannot contain a secret, and these few
+# substring searches cost far less than any regex pass over the text.
+# Joining the patterns into one alternation is not used as a gate: it loses
+# each pattern's literal-prefix search and is several times slower on clean
+# text than running the patterns one by one.
+_INDICATORS = ("@", ":", "-", "_", "=", ".", "'", '"', "eyJ", "AKIA")
+
+# Literal prefixes that every match of a (case-sensitive) pattern starts with.
+# A pattern whose prefixes are absent is skipped, and otherwise its scan starts
+# at the first prefix occurrence instead of the top of the text.
+_LITERAL_PREFIXES: dict[str, tuple[str, ...]] = {
+    "jwt": ("eyJ",),
+    "jwt_partial": ("eyJ",),
+    "db_url": ("postgres",),
+    "anthropic_key": ("sk-ant-",),
+    "openai_key": ("sk-",),
+    "hf_token": ("hf_",),
+    "github_token": ("ghp_", "gho_", "ghs_", "ghr_"),
+    "pypi_token": ("pypi-",),
+    "npm_token": ("npm_",),
+    "aws_key": ("AKIA",),
+    "slack_token": ("xox",),
+    "discord_webhook": ("http",),
+    "private_key": ("-----BEGIN ",),
+    "bearer": ("Bearer",),
+}
+
+
+# Literals that occur inside every match of a pattern. If one is missing from the
+# rest of the text the pattern cannot match, so its regex scan is skipped.
+_REQUIRED_LITERALS: dict[str, tuple[str, ...]] = {
+    "jwt": (".",),
+    "db_url": ("://", "@"),
+    "discord_webhook": ("/api/webhooks/",),
+    "cli_token_flag": ("-",),
+    "env_secret": ("=",),
+    "bearer": ("eyJ",),
+    "ip_address": (".",),
+    "url_token": ("=",),
+    "email": ("@",),
+}
+
+
+def _first_prefix_position(text: str, prefixes: tuple[str, ...], start: int) -> int:
+    positions = [pos for pos in (text.find(prefix, start) for prefix in prefixes) if pos >= 0]
+    return min(positions) if positions else -1
+
+
 ALLOWLIST = [
     re.compile(r"noreply@"),
     re.compile(r"@example\.com"),
@@ -132,19 +205,37 @@ ALLOWLIST = [
     re.compile(r"1\.1\.1\.1"),  # Cloudflare DNS
 ]
 
+# One search decides whether any allowlist entry occurs in a match.
+_ALLOW_RE = re.compile("|".join(f"(?:{allow_pat.pattern})" for allow_pat in ALLOWLIST))
+
 
 def _shannon_entropy(s: str) -> float:
     """Higher values indicate more random-looking strings."""
     if not s:
         return 0.0
-    freq: dict[str, int] = {}
-    for c in s:
-        freq[c] = freq.get(c, 0) + 1
-    length = len(s)
-    return -sum((count / length) * math.log2(count / length) for count in freq.values())
+    return _entropy_from_counts(Counter(s), len(s))
+
+
+def _entropy_from_counts(counts: Counter, length: int) -> float:
+    # Counter tallies characters in C; the sum runs once per distinct character.
+    log2 = math.log2
+    return -sum((count / length) * log2(count / length) for count in counts.values())
+
 
+def _looks_high_entropy(inner: str) -> bool:
+    """Mixed char types, entropy >= 3.5 and at most two dots, from one character tally.
 
-def _has_mixed_char_types(s: str) -> bool:
+    The character-class and entropy checks then only walk the distinct characters.
+    """
+    counts = Counter(inner)
+    if counts["."] > 2:
+        return False
+    if not _has_mixed_char_types(counts):
+        return False
+    return _entropy_from_counts(counts, len(inner)) >= 3.5
+
+
+def _has_mixed_char_types(s: Iterable[str]) -> bool:
     """Check if string has a mix of uppercase, lowercase, and digits."""
     has_upper = has_lower = has_digit = False
     for c in s:
@@ -159,27 +250,91 @@ def _has_mixed_char_types(s: str) -> bool:
     return False
 
 
+class _ResultCache:
+    """Small thread-safe LRU keyed by a digest of the text, so large texts aren't held as keys."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._data: OrderedDict[bytes, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+    def get(self, key: bytes) -> Any:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: bytes, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+# Sessions repeat system prompts and tool output, so identical texts are common.
+_SCAN_CACHE = _ResultCache(maxsize=4096)
+_REDACT_CACHE = _ResultCache(maxsize=4096)
+# Redacted results hold a whole text (the caller's own string when nothing
+# was redacted), so only texts up to this size are cached; larger ones, such
+# as long tool outputs, would otherwise keep megabytes alive per entry.
+_REDACT_CACHE_MAX_CHARS = 64 * 1024
+
+
 def scan_text(text: str) -> list[dict]:
     if not text:
         return []
 
+    key = _ResultCache.key(text)
+    cached = _SCAN_CACHE.get(key)
+    if cached is None:
+        cached = tuple(_scan_text(text))
+        _SCAN_CACHE.put(key, cached)
+    # Hand out copies: callers sort and mutate the returned findings.
+    return [dict(finding) for finding in cached]
+
+
+def _scan_text(text: str, field_starts: list[int] | None = None) -> list[dict] | None:
+    """Scan ``text`` for secrets.
+
+    ``field_starts`` marks ``text`` as several fields joined with
+    ``_FIELD_SEP``; the scan then gives up and returns ``None`` as soon as a
+    candidate match is not contained in a single field.
+    """
+    if not any(indicator in text for indicator in _INDICATORS):
+        return []
+
     findings = []
     for name, pattern in SECRET_PATTERNS:
-        for match in pattern.finditer(text):
+        start = 0
+        prefixes = _LITERAL_PREFIXES.get(name)
+        if prefixes is not None:
+            start = _first_prefix_position(text, prefixes, 0)
+            if start < 0:
+                continue
+        required = _REQUIRED_LITERALS.get(name)
+        if required is not None and any(text.find(literal, start) < 0 for literal in required):
+            continue
+        for match in pattern.finditer(text, start):
+            if field_starts is not None and not _within_one_field(match, field_starts):
+                return None
             matched_text = match.group(0)
 
-            if any(allow_pat.search(matched_text) for allow_pat in ALLOWLIST):
+            if _ALLOW_RE.search(matched_text):
                 continue
 
             # For high_entropy, verify string actually looks like a secret
-            if name == "high_entropy":
-                inner = matched_text[1:-1]  # strip quotes
-                if not _has_mixed_char_types(inner):
-                    continue
-                if _shannon_entropy(inner) < 3.5:
-                    continue
-                if inner.count(".") > 2:
-                    continue
+            if name == "high_entropy" and not _looks_high_entropy(matched_text[1:-1]):
+                continue
 
             findings.append({
                 "type": name,
@@ -194,74 +349,175 @@ def scan_text(text: str) -> list[dict]:
 def redact_text(text: str) -> tuple[str, int]:
     if not text:
         return text, 0
+    if len(text) > _REDACT_CACHE_MAX_CHARS:
+        return _redact_text(text)
+
+    key = _ResultCache.key(text)
+    cached = _REDACT_CACHE.get(key)
+    if cached is None:
+        cached = _redact_text(text)
+        _REDACT_CACHE.put(key, cached)
+    return cached
 
-    findings = scan_text(text)
+
+def _redact_text(text: str) -> tuple[str, int]:
+    return _apply_findings(text, scan_text(text))
+
+
+_finding_start = itemgetter("start")
+
+
+def _apply_findings(text: str, findings: list[dict]) -> tuple[str, int]:
     if not findings:
         return text, 0
+    if len(findings) == 1:
+        only = findings[0]
+        return text[:only["start"]] + REDACTED + text[only["end"]:], 1
 
     # Sort by position (descending start) to replace without shifting indices
-    findings.sort(key=lambda f: f["start"], reverse=True)
-
-    # Deduplicate overlapping findings (keep the later-starting match on overlap)
-    deduped = []
-    for f in findings:
-        if not deduped or f["end"] <= deduped[-1]["start"]:
-            deduped.append(f)
+    findings.sort(key=_finding_start, reverse=True)
 
-    # Replace from end-to-start using parts joining for performance
+    # Replace from end-to-start using parts joining for performance, skipping
+    # overlapping findings (keep the later-starting match on overlap)
     parts = []
     last_pos = len(text)
-    for f in deduped:
+    count = 0
+    for f in findings:
+        if f["end"] > last_pos:
+            continue
         parts.append(text[f["end"]:last_pos])
         parts.append(REDACTED)
         last_pos = f["start"]
+        count += 1
     parts.append(text[:last_pos])
 
-    return "".join(reversed(parts)), len(deduped)
+    return "".join(reversed(parts)), count
+
+
+def _trie_regex(words: Iterable[str]) -> str:
+    """Build a regex alternation matching ``words`` with shared prefixes factored out.
+
+    At every branch point longer continuations are tried first, so the
+    longest listed word wins when several start at the same position.
+    """
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def emit(node: dict) -> str:
+        run = []
+        # Collapse chains with a single continuation into one literal run.
+        while len(node) == 1 and "" not in node:
+            (ch, node), = node.items()
+            run.append(re.escape(ch))
+        branches = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return "".join(run)
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            body = "(?:" + body + ")?"
+        return "".join(run) + body
+
+    return emit(trie)
+
+
+@functools.lru_cache(maxsize=64)
+def _custom_strings_regex(strings: tuple[str, ...]) -> re.Pattern | None:
+    bounded = [target for target in strings if target and len(target) >= 4]
+    short = [target for target in strings if target and len(target) == 3]
+    patterns = []
+    # Use word boundaries for strings of length 4 or more
+    if bounded:
+        patterns.append(rf"\b{_trie_regex(bounded)}\b")
+    if short:
+        patterns.append(_trie_regex(short))
+    if not patterns:
+        return None
+    return re.compile("|".join(patterns))
 
 
 def redact_custom_strings(text: str, strings: list[str]) -> tuple[str, int]:
-    """Redact custom strings from text in a single pass for performance."""
+    """Redact custom strings from text in a single pass for performance.
+
+    The strings are compiled into one prefix-sharing regex (cached per list);
+    where listed strings overlap, the longest one is redacted.
+    """
     if not text or not strings:
         return text, 0
 
-    patterns = []
-    for target in strings:
-        if not target or len(target) < 3:
-            continue
-        escaped = re.escape(target)
-        # Use word boundaries for strings of length 4 or more
-        if len(target) >= 4:
-            patterns.append(rf"\b{escaped}\b")
-        else:
-            patterns.append(escaped)
-
-    if not patterns:
+    combined = _custom_strings_regex(tuple(strings))
+    if combined is None:
         return text, 0
-
-    # Combine all patterns into a single regex for O(N) scan
-    combined = re.compile("|".join(patterns))
     return combined.subn(REDACTED, text)
 
 
+# Session fields are scanned as one buffer joined with this separator. The
+# newlines on either side make field edges look like start/end of text to
+# every lookaround and \b in SECRET_PATTERNS, and the NUL stops \s runs.
+_FIELD_SEP = "\n\x00\x01CLAW\x01\x00\n"
+
+
+def _within_one_field(match: re.Match, field_starts: list[int]) -> bool:
+    start, end = match.span()
+    index = bisect.bisect_right(field_starts, start) - 1
+    if index < 0:
+        return False
+    if index + 1 < len(field_starts):
+        return end <= field_starts[index + 1] - len(_FIELD_SEP)
+    return True
+
+
+def _redact_fields(texts: list[str]) -> tuple[list[str], int] | None:
+    """Redact several field values with one scan over their joined text.
+
+    Returns ``None`` when the fields cannot be joined safely (a value contains
+    the separator or a candidate match straddles two fields); callers then
+    fall back to redacting each field on its own.
+    """
+    if any(type(text) is not str or _FIELD_SEP in text for text in texts):
+        return None
+    field_starts = []
+    offset = 0
+    for text in texts:
+        field_starts.append(offset)
+        offset += len(text) + len(_FIELD_SEP)
+    joined = _FIELD_SEP.join(texts)
+    findings = _scan_text(joined, field_starts)
+    if findings is None:
+        return None
+    redacted, count = _apply_findings(joined, findings)
+    return redacted.split(_FIELD_SEP), count
+
+
 def redact_session(session: dict, custom_strings: list[str] | None = None) -> tuple[dict, int]:
     """Redact all secrets in a session dict. Returns (redacted_session, total_redactions)."""
     total = 0
 
+    slots = []
     for msg in session.get("messages", []):
         for field in ("content", "thinking"):
             if msg.get(field):
-                msg[field], count = redact_text(msg[field])
-                total += count
-                if custom_strings:
-                    msg[field], count = redact_custom_strings(msg[field], custom_strings)
-                    total += count
+                slots.append((msg, field))
         for tool_use in msg.get("tool_uses", []):
             if tool_use.get("input"):
-                tool_use["input"], count = redact_text(tool_use["input"])
-                total += count
-                if custom_strings:
-                    tool_use["input"], count = redact_custom_strings(tool_use["input"], custom_strings)
-                    total += count
+                slots.append((tool_use, "input"))
+
+    joined = _redact_fields([owner[key] for owner, key in slots]) if len(slots) > 1 else None
+    if joined is not None:
+        values, total = joined
+        for (owner, key), value in zip(slots, values):
+            owner[key] = value
+    else:
+        for owner, key in slots:
+            owner[key], count = redact_text(owner[key])
+            total += count
+
+    if custom_strings:
+        for owner, key in slots:
+            owner[key], count = redact_custom_strings(owner[key], custom_strings)
+            total += count
 
     return session, total
@@ -16,9 +16,11 @@ def _parse_dataset_repo(raw: str) -> str | None:
     if not value:
         return None
 
-    match = _HF_DATASET_URL_RE.match(value)
-    if match:
-        return match.group(1).rstrip("/")
+    # Plain "owner/name" input is the common case; only URLs need the regex.
+    if value[:8].lower().startswith(("http://", "https://")):
+        match = _HF_DATASET_URL_RE.match(value)
+        if match:
+            return match.group(1).rstrip("/")
 
     if value.count("/") == 1 and not value.startswith("/") and not value.endswith("/"):
         return value
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import fnmatch
+import functools
 import json
 import os
 from dataclasses import dataclass
@@ -9,9 +11,23 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib decoder
+    orjson = None
+
 EXPERIMENTAL = "experimental"
 STABLE = "stable"
 
+# Copied rather than rebuilt from a literal for every session file.
+_STATS_PROTOTYPE: dict[str, int] = {
+    "user_messages": 0,
+    "assistant_messages": 0,
+    "tool_uses": 0,
+    "input_tokens": 0,
+    "output_tokens": 0,
+}
+
 
 @dataclass(frozen=True)
 class SourceAdapter:
@@ -26,7 +42,12 @@ def _home() -> Path:
 
 
 def _adapter_roots() -> dict[str, SourceAdapter]:
-    home = _home()
+    return _adapter_roots_for(_home())
+
+
+@functools.lru_cache(maxsize=8)
+def _adapter_roots_for(home: Path) -> dict[str, SourceAdapter]:
+    # Cached per home directory; callers must treat the mapping as read-only.
     return {
         "cursor": SourceAdapter(
             name="cursor",
@@ -78,33 +99,57 @@ def iter_external_adapters() -> list[SourceAdapter]:
     return list(_adapter_roots().values())
 
 
-def _iter_adapter_files(adapter: SourceAdapter) -> list[Path]:
-    files: list[Path] = []
-    for root in adapter.roots:
-        if not root.exists():
+def _walk_files(root: str, pattern: str) -> list[tuple[str, int]]:
+    """Recursively collect ``(path, size)`` for files under ``root`` matching ``pattern``.
+
+    Uses ``os.scandir`` so sizes come from the directory walk instead of a
+    ``stat`` per ``Path``; like ``Path.rglob`` it does not descend into
+    symlinked directories and skips unreadable ones.
+    """
+    found: list[tuple[str, int]] = []
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif fnmatch.fnmatch(entry.name, pattern):
+                        try:
+                            size = entry.stat().st_size
+                        except OSError:  # dangling symlink
+                            size = 0
+                        found.append((entry.path, size))
+        except OSError:
             continue
+    # Same order as sorting the equivalent Path objects.
+    found.sort(key=lambda item: item[0].split(os.sep))
+    return found
+
+
+def _iter_adapter_files(adapter: SourceAdapter) -> list[tuple[str, int]]:
+    files: list[tuple[str, int]] = []
+    for root in adapter.roots:
         for pattern in adapter.file_globs:
-            files.extend(sorted(root.rglob(pattern)))
+            files.extend(_walk_files(str(root), pattern))
     return files
 
 
 def discover_external_projects() -> list[dict[str, Any]]:
     projects: list[dict[str, Any]] = []
     for adapter in iter_external_adapters():
-        by_project: dict[str, list[Path]] = {}
-        for file in _iter_adapter_files(adapter):
-            parent = file.parent
-            key = str(parent)
-            by_project.setdefault(key, []).append(file)
+        by_project: dict[str, list[int]] = {}
+        for path, size in _iter_adapter_files(adapter):
+            by_project.setdefault(os.path.dirname(path), []).append(size)
 
-        for key, files in by_project.items():
+        for key, sizes in by_project.items():
             project_name = Path(key).name or "unknown"
             projects.append(
                 {
                     "dir_name": key,
                     "display_name": f"{adapter.name}:{project_name}",
-                    "session_count": len(files),
-                    "total_size_bytes": sum(f.stat().st_size for f in files if f.exists()),
+                    "session_count": len(sizes),
+                    "total_size_bytes": sum(sizes),
                     "source": adapter.name,
                     "adapter_tier": adapter.tier,
                 }
@@ -120,6 +165,44 @@ def _normalize_timestamp(value: Any) -> str:
     return datetime.now(tz=timezone.utc).isoformat()
 
 
+def _loads_json(raw: bytes | str) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    # json tolerates NaN/Infinity and invalid UTF-8 (after replacement) where orjson does not.
+    if isinstance(raw, bytes):
+        raw = raw.decode("utf-8", errors="replace")
+    return json.loads(raw)
+
+
+def _iter_records(file: Path):
+    """Yield the JSON records of an adapter file: one per line for ``.jsonl``,
+    the whole document otherwise. Blank and malformed records are skipped."""
+    with file.open("rb") as fh:
+        chunks = fh if file.suffix.lower() == ".jsonl" else (fh.read(),)
+        for chunk in chunks:
+            chunk = chunk.strip()
+            if not chunk:
+                continue
+            try:
+                yield _loads_json(chunk)
+            except ValueError:
+                continue
+
+
+def _count_message(stats: dict[str, int], message: dict[str, Any]) -> None:
+    words = max(1, len(message["content"].split()))
+    if message["role"] == "user":
+        stats["user_messages"] += 1
+        stats["input_tokens"] += words
+    else:
+        stats["assistant_messages"] += 1
+        stats["output_tokens"] += words
+    stats["tool_uses"] += len(message.get("tool_uses", []))
+
+
 def parse_external_project_sessions(
     source: str,
     project_dir_name: str,
@@ -131,63 +214,55 @@ def parse_external_project_sessions(
     if not project_path.exists():
         return []
 
+    adapter = _adapter_roots().get(source)
+    tier = adapter.tier if adapter is not None else EXPERIMENTAL
     sessions: list[dict[str, Any]] = []
     for file in sorted([*project_path.glob("*.jsonl"), *project_path.glob("*.json")]):
-        try:
-            raw = file.read_text(encoding="utf-8", errors="replace")
-        except OSError:
-            continue
-        lines = raw.splitlines() if file.suffix.lower() == ".jsonl" else [raw]
         messages: list[dict[str, Any]] = []
+        stats = _STATS_PROTOTYPE.copy()
         start_time = None
         end_time = None
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                item = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-
-            if isinstance(item, dict) and isinstance(item.get("messages"), list):
-                for msg in item["messages"]:
-                    if not isinstance(msg, dict):
-                        continue
-                    role = str(msg.get("role", "user"))
-                    content = anonymizer.text(str(msg.get("content", "") or ""))
-                    entry = {
-                        "role": role,
-                        "content": content,
-                        "timestamp": _normalize_timestamp(msg.get("timestamp")),
-                    }
-                    if include_thinking and "thinking" in msg:
-                        entry["thinking"] = anonymizer.text(str(msg.get("thinking", "")))
-                    if msg.get("tool_uses"):
-                        entry["tool_uses"] = msg.get("tool_uses", [])
-                    messages.append(entry)
-                continue
+        try:
+            for item in _iter_records(file):
+                if isinstance(item, dict) and isinstance(item.get("messages"), list):
+                    for msg in item["messages"]:
+                        if not isinstance(msg, dict):
+                            continue
+                        role = str(msg.get("role", "user"))
+                        content = anonymizer.text(str(msg.get("content", "") or ""))
+                        entry = {
+                            "role": role,
+                            "content": content,
+                            "timestamp": _normalize_timestamp(msg.get("timestamp")),
+                        }
+                        if include_thinking and "thinking" in msg:
+                            entry["thinking"] = anonymizer.text(str(msg.get("thinking", "")))
+                        if msg.get("tool_uses"):
+                            entry["tool_uses"] = msg.get("tool_uses", [])
+                        messages.append(entry)
+                        _count_message(stats, entry)
+                    continue
 
-            role = str(item.get("role") or item.get("type") or "user")
-            content = str(item.get("content") or item.get("text") or item.get("message") or "")
-            if not content.strip():
-                continue
-            timestamp = _normalize_timestamp(item.get("timestamp"))
-            if start_time is None:
-                start_time = timestamp
-            end_time = timestamp
-            messages.append(
-                {
+                role = str(item.get("role") or item.get("type") or "user")
+                content = str(item.get("content") or item.get("text") or item.get("message") or "")
+                if not content.strip():
+                    continue
+                timestamp = _normalize_timestamp(item.get("timestamp"))
+                if start_time is None:
+                    start_time = timestamp
+                end_time = timestamp
+                entry = {
                     "role": role,
                     "content": anonymizer.text(content.strip()),
                     "timestamp": timestamp,
                 }
-            )
+                messages.append(entry)
+                _count_message(stats, entry)
+        except OSError:
+            continue
 
         if not messages:
             continue
-        input_tokens = sum(max(1, len(m.get("content", "").split())) for m in messages if m.get("role") == "user")
-        output_tokens = sum(max(1, len(m.get("content", "").split())) for m in messages if m.get("role") != "user")
         sessions.append(
             {
                 "session_id": file.stem,
@@ -197,15 +272,9 @@ def parse_external_project_sessions(
                 "start_time": start_time,
                 "end_time": end_time or start_time,
                 "messages": messages,
-                "stats": {
-                    "user_messages": sum(1 for m in messages if m.get("role") == "user"),
-                    "assistant_messages": sum(1 for m in messages if m.get("role") != "user"),
-                    "tool_uses": sum(len(m.get("tool_uses", [])) for m in messages),
-                    "input_tokens": input_tokens,
-                    "output_tokens": output_tokens,
-                },
+                "stats": stats,
                 "source": source,
-                "adapter_tier": _adapter_roots().get(source, SourceAdapter(source, EXPERIMENTAL, tuple())).tier,
+                "adapter_tier": tier,
             }
         )
     return sessions
@@ -3,23 +3,54 @@
 from __future__ import annotations
 
 import base64
+import contextlib
+import functools
+import io
 import json
+import logging
 import os
-import secrets
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator
 
 from .config import CodeClawConfig, load_config, save_config
-
-_ENC_PREFIX = "CODECLAW_ENCRYPTED_V1:"
+from .source_adapters import _loads_json
+
+logger = logging.getLogger(__name__)
+
+# V1: Fernet (AES-128-CBC + HMAC-SHA256), still decrypted for existing files.
+# V2: AES-256-GCM under an HKDF-derived key; written for in-memory payloads.
+# V3: V2's cipher over 64 KiB frames, one base64 frame per line; written
+#     for files so they can be decrypted as a stream.
+_ENC_PREFIX_V1 = "CODECLAW_ENCRYPTED_V1:"
+_ENC_PREFIX_V2 = "CODECLAW_ENCRYPTED_V2:"
+_ENC_PREFIX_V3 = "CODECLAW_ENCRYPTED_V3:"
+_ENC_PREFIXES = (_ENC_PREFIX_V1, _ENC_PREFIX_V2, _ENC_PREFIX_V3)
+_ENC_PREFIXES_BYTES = tuple(prefix.encode("utf-8") for prefix in _ENC_PREFIXES)
+_ENC_PREFIX_V2_BYTES = _ENC_PREFIXES_BYTES[1]
+# Every prefix has the same length, so a payload's version is one dict lookup
+# on its leading bytes.
+_ENVELOPE_VERSIONS = {prefix: version for version, prefix in enumerate(_ENC_PREFIXES_BYTES, start=1)}
+_ENC_PREFIX_LEN = len(_ENC_PREFIX_V1)
+_GCM_NONCE_SIZE = 12
+_FRAME_SIZE = 64 * 1024
 _LOCAL_KEY_FILE = Path.home() / ".codeclaw" / "encryption.key"
 _KEYRING_SERVICE = "codeclaw"
 
+# Raw keys resolved per key_ref, so bulk encrypt/decrypt does not repeat the
+# keyring round trip or key-file read for every payload.
+_KEY_CACHE: dict[str | None, str] = {}
+
 
 class EncryptionError(RuntimeError):
     """Raised when encrypted content cannot be decrypted."""
 
 
+# Import lookups are memoized: these run for every payload encrypted or
+# decrypted, and a failed import would otherwise be retried each time.
+@functools.lru_cache(maxsize=1)
 def _load_crypto():
     try:
         from cryptography.fernet import Fernet
@@ -28,6 +59,7 @@ def _load_crypto():
     return Fernet
 
 
+@functools.lru_cache(maxsize=1)
 def _load_keyring():
     try:
         import keyring
@@ -36,10 +68,42 @@ def _load_keyring():
     return keyring
 
 
+@functools.lru_cache(maxsize=8)
 def _to_fernet_key(raw_key: str) -> bytes:
+    # V1 payloads were written with this exact derivation; changing it would
+    # make every existing artifact undecryptable.
     return base64.urlsafe_b64encode(raw_key.encode("utf-8")[:32].ljust(32, b"0"))
 
 
+@functools.lru_cache(maxsize=4)
+def _fernet_for(raw_key: str):
+    # Fernet holds only its derived keys and builds fresh cipher contexts per
+    # call, so one shared instance serves concurrent callers without a pool.
+    return _load_crypto()(_to_fernet_key(raw_key))
+
+
+@functools.lru_cache(maxsize=4)
+def _aesgcm_for(raw_key: str):
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+    from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+    key = HKDF(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=None,
+        info=b"codeclaw-encryption-v2",
+    ).derive(raw_key.encode("utf-8"))
+    return AESGCM(key)
+
+
+def _invalidate_key_cache() -> None:
+    _KEY_CACHE.clear()
+    _fernet_for.cache_clear()
+    _to_fernet_key.cache_clear()
+    _aesgcm_for.cache_clear()
+
+
 def _read_local_fallback_key() -> str | None:
     if not _LOCAL_KEY_FILE.exists():
         return None
@@ -52,18 +116,11 @@ def _read_local_fallback_key() -> str | None:
 def _write_local_fallback_key(key: str) -> None:
     _LOCAL_KEY_FILE.parent.mkdir(parents=True, exist_ok=True)
     _LOCAL_KEY_FILE.write_text(key, encoding="utf-8")
-    with contextlib_suppress_oserror():
+    _invalidate_key_cache()
+    with contextlib.suppress(OSError):
         _LOCAL_KEY_FILE.chmod(0o600)
 
 
-class contextlib_suppress_oserror:
-    def __enter__(self):
-        return None
-
-    def __exit__(self, exc_type, exc, _tb):
-        return exc_type is not None and issubclass(exc_type, OSError)
-
-
 def ensure_encryption_key(config: CodeClawConfig | None = None) -> tuple[bool, str | None, str | None]:
     """Ensure encryption key reference exists and return status.
 
@@ -84,31 +141,48 @@ def ensure_encryption_key(config: CodeClawConfig | None = None) -> tuple[bool, s
 
     fallback = _read_local_fallback_key()
     if fallback:
-        if cfg.get("encryption_key_ref") != "file:default":
-            cfg["encryption_key_ref"] = "file:default"
-            save_config(cfg)
+        _remember_key_ref(cfg, "file:default")
         return True, "file:default", "file"
 
-    raw_key = secrets.token_urlsafe(32)
+    # One urandom read covers both the key (as token_urlsafe(32) would encode
+    # it) and the keyring reference suffix.
+    entropy = os.urandom(32 + 8)
+    raw_key = base64.urlsafe_b64encode(entropy[:32]).rstrip(b"=").decode("ascii")
     if keyring_mod is not None:
-        key_ref = f"key-{secrets.token_hex(8)}"
+        key_ref = f"key-{entropy[32:].hex()}"
         try:
             keyring_mod.set_password(_KEYRING_SERVICE, key_ref, raw_key)
-            cfg["encryption_key_ref"] = key_ref
-            save_config(cfg)
+            _invalidate_key_cache()
+            _remember_key_ref(cfg, key_ref)
             return True, key_ref, "keyring"
         except Exception:
             pass
 
     _write_local_fallback_key(raw_key)
-    cfg["encryption_key_ref"] = "file:default"
-    save_config(cfg)
+    _remember_key_ref(cfg, "file:default")
     return True, "file:default", "file"
 
 
+def _remember_key_ref(cfg: CodeClawConfig, key_ref: str) -> None:
+    # save_config rewrites the whole config file; skip it when nothing changed.
+    if cfg.get("encryption_key_ref") != key_ref:
+        cfg["encryption_key_ref"] = key_ref
+        save_config(cfg)
+
+
 def _resolve_raw_key(config: CodeClawConfig | None = None) -> str | None:
     cfg = config if config is not None else load_config()
     key_ref = cfg.get("encryption_key_ref")
+    cached = _KEY_CACHE.get(key_ref)
+    if cached is not None:
+        return cached
+    value = _lookup_raw_key(key_ref)
+    if value:
+        _KEY_CACHE[key_ref] = value
+    return value
+
+
+def _lookup_raw_key(key_ref: str | None) -> str | None:
     keyring_mod = _load_keyring()
     if key_ref and keyring_mod is not None and key_ref != "file:default":
         try:
@@ -135,19 +209,101 @@ def encryption_status(config: CodeClawConfig | None = None) -> dict[str, Any]:
 
 
 def is_encrypted_text(text: str) -> bool:
-    return text.startswith(_ENC_PREFIX)
+    # Nearly every text checked is plain; one character compare rejects it
+    # before the prefixes are tried.
+    return text[:1] == "C" and text.startswith(_ENC_PREFIXES)
+
+
+def is_encrypted_bytes(data: bytes) -> bool:
+    return data[:1] == b"C" and data.startswith(_ENC_PREFIXES_BYTES)
+
+
+def is_encrypted_file(path: Path) -> bool:
+    """Check the envelope prefix of ``path`` without reading or decrypting the rest."""
+    with path.open("rb") as f:
+        return is_encrypted_bytes(f.read(_ENC_PREFIX_LEN))
 
 
 def encrypt_text(plain: str, config: CodeClawConfig | None = None) -> str:
+    sealed = _seal(plain.encode("utf-8"), config)
+    return plain if sealed is None else sealed.decode("ascii")
+
+
+def encrypt_bytes(plain: bytes, config: CodeClawConfig | None = None) -> bytes:
+    """Encrypt UTF-8 ``plain`` into V2 envelope bytes, staying in bytes throughout.
+
+    Like ``encrypt_text``, returns the input unchanged when no cipher or key
+    is available.
+    """
+    sealed = _seal(plain, config)
+    return plain if sealed is None else sealed
+
+
+def _seal(data: bytes, config: CodeClawConfig | None) -> bytes | None:
+    crypto = _load_crypto()
+    if crypto is None:
+        return None
+    raw_key = _resolve_raw_key(config)
+    if not raw_key:
+        return None
+    nonce = os.urandom(_GCM_NONCE_SIZE)
+    sealed = _aesgcm_for(raw_key).encrypt(nonce, data, None)
+    return _ENC_PREFIX_V2_BYTES + base64.urlsafe_b64encode(nonce + sealed)
+
+
+def _frame_aad(index: int, last: bool) -> bytes:
+    # Binding each frame's position and the end marker into its tag rejects
+    # reordered, dropped, truncated or appended frames.
+    return index.to_bytes(8, "big") + (b"\x01" if last else b"\x00")
+
+
+def encrypt_framed_text(plain: str, config: CodeClawConfig | None = None) -> str:
+    """Encrypt ``plain`` as a V3 payload that can be decrypted frame by frame."""
     crypto = _load_crypto()
     if crypto is None:
         return plain
     raw_key = _resolve_raw_key(config)
     if not raw_key:
         return plain
-    fernet = crypto(_to_fernet_key(raw_key))
-    token = fernet.encrypt(plain.encode("utf-8")).decode("utf-8")
-    return f"{_ENC_PREFIX}{token}"
+    aesgcm = _aesgcm_for(raw_key)
+    data = plain.encode("utf-8")
+    count = max(1, -(-len(data) // _FRAME_SIZE))
+    frames = []
+    for index in range(count):
+        nonce = os.urandom(_GCM_NONCE_SIZE)
+        chunk = data[index * _FRAME_SIZE:(index + 1) * _FRAME_SIZE]
+        sealed = aesgcm.encrypt(nonce, chunk, _frame_aad(index, index == count - 1))
+        frames.append(base64.urlsafe_b64encode(nonce + sealed).decode("ascii"))
+    # The first frame shares the prefix line, so small files stay one line.
+    return _ENC_PREFIX_V3 + "\n".join(frames)
+
+
+def _iter_frames(frames: Iterable[bytes], raw_key: str) -> Iterator[bytes]:
+    """Decrypt the base64 frame lines of a V3 payload, yielding plaintext chunks.
+
+    Each frame is held back until the next one is seen, so the final frame is
+    known when it is decrypted. Raises on any frame that fails to authenticate.
+    """
+    aesgcm = _aesgcm_for(raw_key)
+    index = 0
+    pending = None
+    for frame in frames:
+        frame = frame.strip()
+        if not frame:
+            continue
+        if pending is not None:
+            yield _decrypt_frame(aesgcm, pending, index, last=False)
+            index += 1
+        pending = frame
+    if pending is None:
+        raise ValueError("Encrypted payload has no frames.")
+    yield _decrypt_frame(aesgcm, pending, index, last=True)
+
+
+def _decrypt_frame(aesgcm, frame: bytes, index: int, last: bool) -> bytes:
+    sealed = base64.urlsafe_b64decode(frame)
+    nonce, sealed = sealed[:_GCM_NONCE_SIZE], sealed[_GCM_NONCE_SIZE:]
+    return aesgcm.decrypt(nonce, sealed, _frame_aad(index, last))
 
 
 def decrypt_text(
@@ -157,43 +313,107 @@ def decrypt_text(
 ) -> str:
     if not is_encrypted_text(payload):
         return payload
+    plain = _decrypt_envelope(payload.encode("utf-8"), config=config, strict=strict)
+    return payload if plain is None else plain
+
+
+def _decrypt_envelope(
+    envelope: bytes,
+    config: CodeClawConfig | None = None,
+    strict: bool = False,
+) -> str | None:
+    """Decrypt a prefixed payload given as the bytes read from disk.
+
+    Returns ``None`` when it cannot be decrypted and ``strict`` is off, so
+    callers only decode the ciphertext to text in that fallback case.
+    """
+    raw_key = _envelope_key(config, strict)
+    if raw_key is None:
+        return None
+    version = _ENVELOPE_VERSIONS.get(envelope[:_ENC_PREFIX_LEN])
+    token = envelope[_ENC_PREFIX_LEN:]
+    try:
+        if version == 1:
+            plain = _fernet_for(raw_key).decrypt(token)
+        elif version == 3:
+            plain = b"".join(_iter_frames(token.splitlines(), raw_key))
+        else:
+            sealed = base64.urlsafe_b64decode(token)
+            nonce, sealed = sealed[:_GCM_NONCE_SIZE], sealed[_GCM_NONCE_SIZE:]
+            plain = _aesgcm_for(raw_key).decrypt(nonce, sealed, None)
+        return plain.decode("utf-8", errors="replace")
+    except Exception:
+        if strict:
+            raise EncryptionError("Encrypted content could not be decrypted with the current key.")
+        return None
+
+
+def _envelope_key(config: CodeClawConfig | None, strict: bool) -> str | None:
+    """Return the raw key for decrypting, or ``None`` (raising when ``strict``)."""
     crypto = _load_crypto()
     if crypto is None:
         if strict:
             raise EncryptionError("Encrypted content detected but 'cryptography' is unavailable.")
-        return payload
+        return None
     raw_key = _resolve_raw_key(config)
     if not raw_key:
         if strict:
             raise EncryptionError("Encrypted content detected but no encryption key is available.")
-        return payload
-    token = payload[len(_ENC_PREFIX):]
-    try:
-        fernet = crypto(_to_fernet_key(raw_key))
-        return fernet.decrypt(token.encode("utf-8")).decode("utf-8", errors="replace")
-    except Exception:
-        if strict:
-            raise EncryptionError("Encrypted content could not be decrypted with the current key.")
-        return payload
+        return None
+    return raw_key
 
 
 def maybe_encrypt_file(path: Path, config: CodeClawConfig | None = None) -> bool:
+    cfg = _encryption_config(config)
+    if cfg is None:
+        return False
+    return _encrypt_file(path, cfg)
+
+
+def maybe_encrypt_files(
+    paths: Iterable[Path],
+    config: CodeClawConfig | None = None,
+    max_workers: int | None = None,
+) -> list[bool]:
+    """``maybe_encrypt_file`` over many paths, sharing one config and key lookup.
+
+    The cipher and file I/O release the GIL, so the files are handled on a
+    thread pool. Returns one result per path, in order.
+    """
+    paths = list(paths)
+    cfg = _encryption_config(config)
+    if cfg is None:
+        return [False] * len(paths)
+    if len(paths) < 2:
+        return [_encrypt_file(path, cfg) for path in paths]
+    workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(functools.partial(_encrypt_file, config=cfg), paths))
+
+
+def _encryption_config(config: CodeClawConfig | None = None) -> CodeClawConfig | None:
+    """Return the config to encrypt with, or ``None`` when encryption is off or no key can be had."""
     cfg = config if config is not None else load_config()
     if "encryption_enabled" not in cfg:
-        return False
+        return None
     if not cfg.get("encryption_enabled", True):
-        return False
+        return None
     status = encryption_status(cfg)
     if not status.get("key_present"):
         available, key_ref, _backend = ensure_encryption_key(cfg)
         if available and key_ref:
             cfg["encryption_key_ref"] = key_ref
         else:
-            return False
-    payload = read_text(path, config=cfg, strict=False)
-    if is_encrypted_text(payload):
+            return None
+    return cfg
+
+
+def _encrypt_file(path: Path, config: CodeClawConfig) -> bool:
+    # Already encrypted: the header says so, no need to read or decrypt the rest.
+    if is_encrypted_file(path):
         return True
-    encrypted = encrypt_text(payload, config=cfg)
+    payload = read_text(path, config=config, strict=False)
+    encrypted = encrypt_framed_text(payload, config=config)
     if encrypted == payload:
         return False
     write_text(path, encrypted)
@@ -201,11 +421,22 @@ def maybe_encrypt_file(path: Path, config: CodeClawConfig | None = None) -> bool
 
 
 def write_text(path: Path, text: str) -> None:
+    """Atomically replace ``path`` with ``text``, owner-readable only.
+
+    The text goes to a temporary file in the same directory, which mkstemp
+    creates with mode 0600, and is renamed over ``path``; a crash mid-write
+    leaves the previous artifact intact rather than a truncated one.
+    """
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(text, encoding="utf-8")
-    if os.name != "nt":
-        with contextlib_suppress_oserror():
-            path.chmod(0o600)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_name, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_name)
+        raise
 
 
 def read_text(
@@ -213,23 +444,129 @@ def read_text(
     config: CodeClawConfig | None = None,
     strict: bool = False,
 ) -> str:
-    raw = path.read_text(encoding="utf-8", errors="replace")
-    return decrypt_text(raw, config=config, strict=strict)
+    raw = path.read_bytes()
+    # Plain artifacts are the common case: return them without resolving a key.
+    # Ciphertext goes to the cipher as read, without a round trip through str.
+    if is_encrypted_bytes(raw):
+        plain = _decrypt_envelope(raw, config=config, strict=strict)
+        if plain is not None:
+            return plain
+    return raw.decode("utf-8", errors="replace")
 
 
-def read_jsonl(
+def _iter_lines(
     path: Path,
     config: CodeClawConfig | None = None,
     strict: bool = False,
-) -> list[dict[str, Any]]:
-    text = read_text(path, config=config, strict=strict)
-    rows: list[dict[str, Any]] = []
-    for line in text.splitlines():
+) -> Iterator[bytes | str]:
+    """Yield the lines of a possibly encrypted text file.
+
+    Plain files and framed (V3) files are streamed from disk, one line or one
+    frame at a time. Older envelopes are a single token, so they are
+    decrypted whole and their plaintext iterated without splitting it into a
+    list first.
+    """
+    with path.open("rb") as f:
+        version = _ENVELOPE_VERSIONS.get(f.read(_ENC_PREFIX_LEN))
+        if version == 3:
+            yield from _iter_framed_lines(f, config=config, strict=strict, source=str(path))
+            return
+        if version is not None:
+            f.seek(0)
+            raw = f.read()
+            plain = _decrypt_envelope(raw, config=config, strict=strict)
+            if plain is None:
+                plain = raw.decode("utf-8", errors="replace")
+            yield from io.StringIO(plain)
+            return
+        f.seek(0)
+        yield from f
+
+
+def _iter_framed_lines(
+    frames: Iterable[bytes],
+    config: CodeClawConfig | None = None,
+    strict: bool = False,
+    source: str = "encrypted content",
+) -> Iterator[bytes]:
+    # Without a usable key the frames are skipped: their base64 lines would
+    # never parse as rows anyway.
+    raw_key = _envelope_key(config, strict)
+    if raw_key is None:
+        return
+    chunks = _iter_frames(frames, raw_key)
+    carry = b""
+    index = 0
+    while True:
+        try:
+            chunk = next(chunks, None)
+        except Exception:
+            if strict:
+                raise EncryptionError("Encrypted content could not be decrypted with the current key.")
+            # Lines from earlier frames were already handed out; make sure
+            # the caller's partial result doesn't pass for the whole file.
+            if index:
+                logger.warning(
+                    "%s: encrypted frame %d failed to decrypt (truncated, tampered or wrong key); "
+                    "only the lines before it were read",
+                    source,
+                    index,
+                )
+            else:
+                logger.warning("%s: encrypted content could not be decrypted with the current key", source)
+            return
+        index += 1
+        if chunk is None:
+            break
+        lines = (carry + chunk).split(b"\n")
+        carry = lines.pop()
+        yield from lines
+    if carry:
+        yield carry
+
+
+# raw_decode lets a line hold several concatenated values.
+_JSON_DECODER = json.JSONDecoder()
+_JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+def _loads_jsonl_line(line: bytes | str) -> list[Any]:
+    """Parse a stripped JSONL line into its values (normally exactly one)."""
+    try:
+        return [_loads_json(line)]
+    except ValueError:
+        pass
+    if isinstance(line, bytes):
+        line = line.decode("utf-8", errors="replace")
+    values = []
+    index = 0
+    while index < len(line):
+        value, index = _JSON_DECODER.raw_decode(line, index)
+        values.append(value)
+        index = _JSON_WHITESPACE.match(line, index).end()
+    return values
+
+
+def iter_jsonl(
+    path: Path,
+    config: CodeClawConfig | None = None,
+    strict: bool = False,
+) -> Iterator[Any]:
+    """Yield parsed rows of a (possibly encrypted) JSONL file, skipping blank/malformed lines."""
+    for line in _iter_lines(path, config=config, strict=strict):
         line = line.strip()
         if not line:
             continue
         try:
-            rows.append(json.loads(line))
-        except json.JSONDecodeError:
+            values = _loads_jsonl_line(line)
+        except ValueError:
             continue
-    return rows
+        yield from values
+
+
+def read_jsonl(
+    path: Path,
+    config: CodeClawConfig | None = None,
+    strict: bool = False,
+) -> list[dict[str, Any]]:
+    return list(iter_jsonl(path, config=config, strict=strict))
@@ -3,13 +3,17 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import contextlib
 import io
+import itertools
 import json
 import logging
 import logging.handlers
+import queue
 import sys
 import time
+from collections import deque
 from pathlib import Path
 from types import SimpleNamespace
 from typing import Any
@@ -26,8 +30,9 @@ from prompt_toolkit.widgets import TextArea
 
 from ..cli._helpers import SOURCE_CHOICES
 from ..cli.export import _run_export
-from ..config import load_config, save_config
+from ..config import config_path, load_config, save_config
 from ..daemon import (
+    daemon_running,
     daemon_status,
     read_recent_logs,
     set_watch_paused,
@@ -50,15 +55,110 @@ class SlashCommandCompleter(Completer):
 
     def get_completions(self, document, complete_event):  # pragma: no cover - thin wrapper
         text = document.text_before_cursor
+        start = -len(text.strip())
         for token in self.registry.completions(text):
-            start = -len(text.strip()) if text.strip() else 0
             yield Completion(token, start_position=start)
 
 
+class _FeedPayloadFormatter(logging.Formatter):
+    """Render the feed payloads attached to a record as one JSON line each.
+
+    RotatingFileHandler formats every record twice, once to size it for the
+    rollover check and once to write it, so the rendered text is kept on the
+    record and the payloads are encoded only once.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        payloads = getattr(record, "payload", None)
+        if payloads is None:
+            return super().format(record)
+        text = getattr(record, "payload_text", None)
+        if text is None:
+            text = "\n".join(json.dumps(payload, ensure_ascii=True) for payload in payloads)
+            record.payload_text = text
+        return text
+
+
+_LOG_LISTENER: logging.handlers.QueueListener | None = None
+_LOG_LISTENER_RUNNING = False
+
+
+def _start_log_listener(listener: logging.handlers.QueueListener | None = None) -> None:
+    global _LOG_LISTENER, _LOG_LISTENER_RUNNING
+    if listener is not None:
+        _stop_log_listener()
+        _LOG_LISTENER = listener
+    if _LOG_LISTENER is not None and not _LOG_LISTENER_RUNNING:
+        _LOG_LISTENER.start()
+        _LOG_LISTENER_RUNNING = True
+
+
+def _stop_log_listener() -> None:
+    """Write out queued log records and stop the writer thread (restarted on next setup)."""
+    global _LOG_LISTENER_RUNNING
+    if _LOG_LISTENER is not None and _LOG_LISTENER_RUNNING:
+        _LOG_LISTENER.stop()
+        _LOG_LISTENER_RUNNING = False
+
+
+_TRUNCATION_NOTICE = "... output truncated ...\n"
+
+
+def _tail_text(text: str, max_chars: int, truncated: bool = False) -> str:
+    """Return ``text``, or its end behind a truncation notice if it exceeds ``max_chars``."""
+    if not truncated and len(text) <= max_chars:
+        return text
+    return _TRUNCATION_NOTICE + text[len(text) - (max_chars - len(_TRUNCATION_NOTICE)):]
+
+
+class _OutputTail(io.TextIOBase):
+    """Write-only text stream that keeps just the last ``max_chars`` characters.
+
+    Stands in for ``io.StringIO`` when capturing job output that is only
+    shown truncated, so a long run does not hold its whole output in memory.
+    """
+
+    NOTICE = _TRUNCATION_NOTICE
+
+    def __init__(self, max_chars: int) -> None:
+        super().__init__()
+        self.max_chars = max_chars
+        self._chunks: deque[str] = deque()
+        self._size = 0
+        self._truncated = False
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        if text:
+            self._chunks.append(text)
+            self._size += len(text)
+            while self._size - len(self._chunks[0]) >= self.max_chars:
+                self._size -= len(self._chunks.popleft())
+                self._truncated = True
+        return len(text)
+
+    def getvalue(self) -> str:
+        return _tail_text("".join(self._chunks), self.max_chars, self._truncated)
+
+
 class CodeClawTuiApp:
     """Main full-screen TUI application."""
 
     SPINNER_FRAMES = ("|", "/", "-", "\\")
+    # Repaints only advance the spinner; mode, project and job count are
+    # recomputed at most this often (or as soon as something changes them).
+    STATUS_REFRESH_SECONDS = 1.0
+    JOB_EVENT_POLL_SECONDS = 0.2
+    FEED_MAX_LINES = 1000
+    JOB_OUTPUT_MAX_CHARS = 4000
+    FEED_PREFIXES = {
+        "error": "[error]",
+        "warning": "[warn]",
+        "success": "[ok]",
+        "info": "[info]",
+    }
 
     def __init__(
         self,
@@ -73,12 +173,18 @@ class CodeClawTuiApp:
         self.last_result_level = "info"
         self.hint = "/help for commands"
         self.spinner_index = 0
-        self.feed_lines: list[str] = []
+        self.feed_lines: deque[str] = deque(maxlen=self.FEED_MAX_LINES)
         self.logger = self._setup_logger()
         self._watch_running = False
         self._watch_paused = False
         self._last_watch_probe = 0.0
+        self._config_cache: dict[str, Any] | None = None
+        self._config_stamp: tuple[int, int] | None = None
+        self._status_next_refresh = 0.0
+        self._status_tail = ""
+        self._status_jobs = 0
 
+        self._export_parser = self._build_export_parser()
         self.registry = CommandRegistry()
         self.jobs = JobManager(max_workers=2)
         self.plugin_manager = PluginManager(
@@ -138,6 +244,7 @@ class CodeClawTuiApp:
         logger = logging.getLogger("codeclaw.tui")
         logger.setLevel(logging.INFO)
         if logger.handlers:
+            _start_log_listener()
             return logger
         handler = logging.handlers.RotatingFileHandler(
             log_dir / "tui.log",
@@ -145,8 +252,12 @@ class CodeClawTuiApp:
             backupCount=3,
             encoding="utf-8",
         )
-        handler.setFormatter(logging.Formatter("%(message)s"))
-        logger.addHandler(handler)
+        handler.setFormatter(_FeedPayloadFormatter("%(message)s"))
+        # The UI thread only enqueues records; JSON encoding and the file
+        # write happen on the listener's thread.
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        _start_log_listener(logging.handlers.QueueListener(log_queue, handler))
         return logger
 
     def _build_keybindings(self) -> KeyBindings:
@@ -166,54 +277,101 @@ class CodeClawTuiApp:
             "| |__| (_) | (_| |  __/___) | | (_| |\\ V  V /  ",
             " \\____\\___/ \\__,_|\\___|____/|_|\\__,_| \\_/\\_/   ",
         ]
-        for line in logo_lines:
-            self.emit_feed(line, level="info")
-        self.emit_feed("CodeClaw TUI ready", level="success")
-        self.emit_feed(f"platform={sys.platform} source={self.source}", level="info")
-        self.emit_feed("Try: /help  /status  /watch status  /logs  /projects  /scope", level="info")
+        self._emit_feed_batch(
+            [(line, "info") for line in logo_lines]
+            + [
+                ("CodeClaw TUI ready", "success"),
+                (f"platform={sys.platform} source={self.source}", "info"),
+                ("Try: /help  /status  /watch status  /logs  /projects  /scope", "info"),
+            ]
+        )
 
-    def _refresh_feed_text(self) -> None:
-        self.feed.text = "\n".join(self.feed_lines[-1000:])
+    def _append_feed(self, lines: list[str]) -> None:
+        # Extend the feed text instead of re-joining every retained line; when
+        # the deque overflows, cut the entries it drops off the front.
+        retained = len(self.feed_lines)
+        dropped = max(0, retained + len(lines) - self.feed_lines.maxlen)
+        if dropped >= retained:
+            self.feed_lines.extend(lines)
+            self.feed.text = "\n".join(self.feed_lines)
+            return
+        cut = sum(len(entry) + 1 for entry in itertools.islice(self.feed_lines, dropped))
+        text = self.feed.text[cut:]
+        self.feed_lines.extend(lines)
+        self.feed.text = f"{text}\n" + "\n".join(lines)
 
     def emit_feed(self, message: str, level: str = "info") -> None:
-        prefix = {
-            "error": "[error]",
-            "warning": "[warn]",
-            "success": "[ok]",
-            "info": "[info]",
-        }.get(level, "[info]")
-        self.feed_lines.append(f"{prefix} {message}")
-        self._refresh_feed_text()
-        payload = {
-            "ts": time.time(),
-            "level": level,
-            "message": message,
-            "mode": self._runtime_mode(),
-            "source": self.source,
-        }
+        self._emit_feed_batch([(message, level)])
+
+    def _emit_feed_batch(self, entries: list[tuple[str, str]]) -> None:
+        """Show several ``(message, level)`` entries with one feed update and one log write."""
+        if not entries:
+            return
+        self._append_feed([f"{self.FEED_PREFIXES.get(level, '[info]')} {message}" for message, level in entries])
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        ts = time.time()
+        mode = self._runtime_mode()
+        payloads = [
+            {"ts": ts, "level": level, "message": message, "mode": mode, "source": self.source}
+            for message, level in entries
+        ]
         with contextlib.suppress(Exception):
-            self.logger.info(json.dumps(payload, ensure_ascii=True))
+            self.logger.info("", extra={"payload": payloads})
 
     def _set_result(self, message: str, level: str = "info") -> None:
         self.last_result = message
         self.last_result_level = level
+        self._status_next_refresh = 0.0
 
     def _status_bar_fragments(self) -> FormattedText:
-        self._drain_job_events()
+        now = time.monotonic()
+        if now >= self._status_next_refresh:
+            self._refresh_status_text(now)
+        spinner = self.SPINNER_FRAMES[self.spinner_index % len(self.SPINNER_FRAMES)] if self._status_jobs else " "
+        self.spinner_index += 1
+        return FormattedText([("", f" CodeClaw {spinner}{self._status_tail}")])
+
+    def _refresh_status_text(self, now: float) -> None:
         self._probe_watch_state()
         self.mode = self._runtime_mode()
-        spinner = self.SPINNER_FRAMES[self.spinner_index % len(self.SPINNER_FRAMES)] if self.jobs.active_count() else " "
-        self.spinner_index += 1
         current_project = self._current_project_label()
-        jobs = self.jobs.active_count()
-        text = (
-            f" CodeClaw {spinner} mode={self.mode} project={current_project} "
-            f"| jobs={jobs} | last={self.last_result} | {self.hint} "
+        self._status_jobs = self.jobs.active_count()
+        self._status_tail = (
+            f" mode={self.mode} project={current_project} "
+            f"| jobs={self._status_jobs} | last={self.last_result} | {self.hint} "
         )
-        return FormattedText([("", text)])
+        self._status_next_refresh = now + self.STATUS_REFRESH_SECONDS
+
+    async def _poll_job_events(self) -> None:
+        while True:
+            if self._drain_job_events():
+                self._status_next_refresh = 0.0
+                self.app.invalidate()
+            await asyncio.sleep(self.JOB_EVENT_POLL_SECONDS)
+
+    def _cached_config(self) -> dict[str, Any]:
+        """Config for read-only use, re-read only when the file changes on disk.
+
+        The status bar repaints several times a second; commands that modify
+        the config still load a fresh copy and save through ``_save_config``.
+        """
+        try:
+            stat = config_path().stat()
+            stamp = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            stamp = None
+        if self._config_cache is None or stamp != self._config_stamp:
+            self._config_cache = load_config()
+            self._config_stamp = stamp
+        return self._config_cache
+
+    def _save_config(self, cfg: dict[str, Any]) -> None:
+        save_config(cfg)
+        self._config_cache = None
 
     def _current_project_label(self) -> str:
-        cfg = load_config()
+        cfg = self._cached_config()
         connected = cfg.get("connected_projects", [])
         if connected:
             if len(connected) == 1:
@@ -242,9 +400,10 @@ class CodeClawTuiApp:
             return
         self._last_watch_probe = now
         with contextlib.suppress(Exception):
-            payload = daemon_status()
-            self._watch_running = bool(payload.get("running"))
-            self._watch_paused = bool(payload.get("paused"))
+            # The pause flag lives in the config, which is cached between
+            # changes; only the pid liveness check touches the system.
+            self._watch_running = daemon_running()
+            self._watch_paused = bool(self._cached_config().get("watch_paused", False))
 
     def _accept_input(self, buffer) -> bool:
         line = buffer.text.strip()
@@ -260,17 +419,24 @@ class CodeClawTuiApp:
             self._set_result("text accepted", level="info")
             return
 
+        self._handle_slash(line)
+
+    def _handle_slash(self, line: str) -> None:
         try:
             parsed = self.registry.parse(line)
-            if parsed is None:
-                self._set_result("invalid command", level="error")
-                self.emit_feed("Invalid command. Use /help.", level="error")
-                return
-            command = self.registry.get(parsed.command_name)
-            if command is None:
-                self._set_result("unknown command", level="error")
-                self.emit_feed(f"Unknown command: /{parsed.command_name}", level="error")
-                return
+        except ValueError as exc:
+            self._report_command_error(exc)
+            return
+        if parsed is None:
+            self._set_result("invalid command", level="error")
+            self.emit_feed("Invalid command. Use /help.", level="error")
+            return
+        command = self.registry.get(parsed.command_name)
+        if command is None:
+            self._set_result("unknown command", level="error")
+            self.emit_feed(f"Unknown command: /{parsed.command_name}", level="error")
+            return
+        try:
             result = command.handler(self, parsed.args)
             if result.message:
                 self.emit_feed(result.message, level="success" if result.ok else "error")
@@ -279,8 +445,11 @@ class CodeClawTuiApp:
                 level="info" if result.ok else "error",
             )
         except Exception as exc:
-            self.emit_feed(f"Command error: {type(exc).__name__}: {exc}", level="error")
-            self._set_result("command error", level="error")
+            self._report_command_error(exc)
+
+    def _report_command_error(self, exc: Exception) -> None:
+        self.emit_feed(f"Command error: {type(exc).__name__}: {exc}", level="error")
+        self._set_result("command error", level="error")
 
     def _register_builtin_commands(self) -> None:
         self.registry.register(
@@ -399,13 +568,7 @@ class CodeClawTuiApp:
         )
 
     def _cmd_help(self, _ctx, _args: list[str]) -> CommandResult:
-        lines = ["Available commands:"]
-        for name, help_text, usage in self.registry.help_rows():
-            if usage:
-                lines.append(f"  {name}: {help_text} | usage: {usage}")
-            else:
-                lines.append(f"  {name}: {help_text}")
-        self.emit_feed("\n".join(lines), level="info")
+        self.emit_feed(self.registry.formatted_help(), level="info")
         return CommandResult(ok=True, message="help displayed")
 
     def _cmd_quit(self, _ctx, _args: list[str]) -> CommandResult:
@@ -413,12 +576,12 @@ class CodeClawTuiApp:
         return CommandResult(ok=True, message="Exiting...")
 
     def _cmd_clear(self, _ctx, _args: list[str]) -> CommandResult:
-        self.feed_lines = []
-        self._refresh_feed_text()
+        self.feed_lines.clear()
+        self.feed.text = ""
         return CommandResult(ok=True, message="feed cleared")
 
     def _cmd_status(self, _ctx, _args: list[str]) -> CommandResult:
-        cfg = load_config()
+        cfg = self._cached_config()
         payload = {
             "mode": self._runtime_mode(),
             "source": cfg.get("source"),
@@ -448,10 +611,10 @@ class CodeClawTuiApp:
             raw_value = " ".join(args[2:])
             with contextlib.suppress(json.JSONDecodeError):
                 cfg[key] = json.loads(raw_value)
-                save_config(cfg)
+                self._save_config(cfg)
                 return CommandResult(True, f"config[{key}] updated")
             cfg[key] = raw_value
-            save_config(cfg)
+            self._save_config(cfg)
             return CommandResult(True, f"config[{key}] updated")
         return CommandResult(False, "Unknown config action. Use get or set.")
 
@@ -512,7 +675,7 @@ class CodeClawTuiApp:
             cfg["source"] = None
         else:
             cfg["source"] = candidate
-        save_config(cfg)
+        self._save_config(cfg)
         return CommandResult(True, f"source updated: {candidate}")
 
     def _cmd_logs(self, _ctx, args: list[str]) -> CommandResult:
@@ -580,15 +743,23 @@ class CodeClawTuiApp:
         cfg["projects_confirmed"] = True
         if self.source in {"claude", "codex", "both"}:
             cfg["source"] = self.source
-        save_config(cfg)
+        self._save_config(cfg)
         scope_label = ", ".join(connected) if connected else "all discovered projects"
         return CommandResult(True, f"scope updated: {scope_label}")
 
     def _cmd_jobs(self, _ctx, _args: list[str]) -> CommandResult:
-        jobs = [job.__dict__ for job in self.jobs.list_jobs()]
+        jobs = []
+        completed = 0
+        for job in self.jobs.list_jobs():
+            view = {"id": job.id, "name": job.name, "status": job.status, "progress": job.progress}
+            if job.error:
+                view["error"] = job.error
+            jobs.append(view)
+            if job.status in {"success", "error", "cancelled"}:
+                completed += 1
         payload = {
             "active": self.jobs.active_count(),
-            "completed": sum(1 for job in jobs if job.get("status") in {"success", "error", "cancelled"}),
+            "completed": completed,
             "jobs": jobs,
         }
         self.emit_feed(json.dumps(payload, indent=2), level="info")
@@ -603,17 +774,10 @@ class CodeClawTuiApp:
         return CommandResult(False, f"unable to cancel job {args[0]}")
 
     def _cmd_export(self, _ctx, args: list[str]) -> CommandResult:
-        parser = argparse.ArgumentParser(prog="/export", add_help=False)
-        parser.add_argument("--push", action="store_true")
-        parser.add_argument("--all-projects", action="store_true")
-        parser.add_argument("--no-thinking", action="store_true")
-        parser.add_argument("--dry-run", action="store_true")
-        parser.add_argument("--source", default=self.source)
-        parser.add_argument("--repo", default=None)
-        parser.add_argument("--output", default=None)
-        parser.add_argument("--publish-attestation", default=None)
+        # --source defaults to whatever source is active at invocation time.
+        self._export_parser.set_defaults(source=self.source)
         try:
-            parsed = parser.parse_args(args)
+            parsed = self._export_parser.parse_args(args)
         except SystemExit:
             return CommandResult(False, "Usage: /export [--push] [--source ...] [--output ...] [--dry-run]")
 
@@ -631,8 +795,8 @@ class CodeClawTuiApp:
 
         def _job_fn(job_ctx: JobContext) -> dict[str, Any]:
             job_ctx.progress(0.05, "starting export")
-            stdout = io.StringIO()
-            stderr = io.StringIO()
+            stdout = _OutputTail(self.JOB_OUTPUT_MAX_CHARS)
+            stderr = _OutputTail(self.JOB_OUTPUT_MAX_CHARS)
             exit_code = 0
             with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
                 try:
@@ -648,6 +812,19 @@ class CodeClawTuiApp:
         job = self.jobs.submit(name="export", fn=_job_fn)
         return CommandResult(True, f"export job queued: {job.id}")
 
+    @staticmethod
+    def _build_export_parser() -> argparse.ArgumentParser:
+        parser = argparse.ArgumentParser(prog="/export", add_help=False)
+        parser.add_argument("--push", action="store_true")
+        parser.add_argument("--all-projects", action="store_true")
+        parser.add_argument("--no-thinking", action="store_true")
+        parser.add_argument("--dry-run", action="store_true")
+        parser.add_argument("--source", default=None)
+        parser.add_argument("--repo", default=None)
+        parser.add_argument("--output", default=None)
+        parser.add_argument("--publish-attestation", default=None)
+        return parser
+
     def _cmd_plugins(self, _ctx, args: list[str]) -> CommandResult:
         if not args:
             args = ["list"]
@@ -681,44 +858,45 @@ class CodeClawTuiApp:
             return CommandResult(False, f"plugin disable failed: {args[1]}")
         return CommandResult(False, "Usage: /plugins list|reload|enable <name>|disable <name>")
 
-    def _drain_job_events(self) -> None:
-        max_output = 4000
-        for event in self.jobs.poll_events():
+    def _drain_job_events(self) -> bool:
+        max_output = self.JOB_OUTPUT_MAX_CHARS
+        events = self.jobs.poll_events()
+        pending: list[tuple[str, str]] = []
+        for event in events:
             if event.kind == "progress":
                 pct = int((event.progress or 0) * 100)
-                self.emit_feed(f"job {event.job_id} progress: {pct}% {event.message}", level="info")
+                pending.append((f"job {event.job_id} progress: {pct}% {event.message}", "info"))
                 continue
             if event.kind == "started":
-                self.emit_feed(f"job {event.job_id} started", level="info")
+                pending.append((f"job {event.job_id} started", "info"))
                 continue
             if event.kind == "success":
                 result = event.payload.get("result") if isinstance(event.payload, dict) else None
-                self.emit_feed(f"job {event.job_id} completed", level="success")
+                pending.append((f"job {event.job_id} completed", "success"))
                 if isinstance(result, dict):
                     stdout = str(result.get("stdout", "")).strip()
                     stderr = str(result.get("stderr", "")).strip()
                     exit_code = int(result.get("exit_code", 0) or 0)
                     if stdout:
-                        if len(stdout) > max_output:
-                            stdout = f"{stdout[:max_output]}\n... output truncated ..."
-                        self.emit_feed(stdout, level="info")
+                        pending.append((_tail_text(stdout, max_output), "info"))
                     if stderr:
-                        if len(stderr) > max_output:
-                            stderr = f"{stderr[:max_output]}\n... output truncated ..."
-                        self.emit_feed(stderr, level="warning")
+                        pending.append((_tail_text(stderr, max_output), "warning"))
                     if exit_code != 0:
-                        self.emit_feed(f"job {event.job_id} exited with code {exit_code}", level="error")
+                        pending.append((f"job {event.job_id} exited with code {exit_code}", "error"))
                 continue
             if event.kind in {"error", "cancelled", "cancelling"}:
                 level = "error" if event.kind == "error" else "warning"
-                self.emit_feed(f"job {event.job_id} {event.kind}: {event.message}", level=level)
+                pending.append((f"job {event.job_id} {event.kind}: {event.message}", level))
                 continue
+        self._emit_feed_batch(pending)
+        return bool(events)
 
     def run(self) -> None:
         try:
-            self.app.run()
+            self.app.run(pre_run=lambda: self.app.create_background_task(self._poll_job_events()))
         finally:
             self.jobs.shutdown()
+            _stop_log_listener()
 
 
 def run_tui(source: str = "auto", plugin_dirs: list[Path] | None = None) -> None:
@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
+import bisect
 import shlex
 from dataclasses import dataclass
 
 from .types import SlashCommand
 
+_SHLEX_SPECIAL = ("'", '"', "\\")
+
 
 @dataclass
 class ParsedCommand:
@@ -23,6 +26,14 @@ class CommandRegistry:
     def __init__(self) -> None:
         self._commands: dict[str, SlashCommand] = {}
         self._aliases: dict[str, str] = {}
+        self._aliases_by_command: dict[str, list[str]] = {}
+        # Derived views, rebuilt lazily after the command set changes.
+        self._sorted_names: tuple[str, ...] | None = None
+        self._help_text: str | None = None
+
+    def _invalidate(self) -> None:
+        self._sorted_names = None
+        self._help_text = None
 
     def register(self, command: SlashCommand) -> None:
         name = command.name.strip().lower()
@@ -31,6 +42,7 @@ class CommandRegistry:
         if name in self._commands:
             raise ValueError(f"Command already registered: {name}")
         self._commands[name] = command
+        self._invalidate()
         for alias in command.aliases:
             normalized = alias.strip().lower()
             if not normalized:
@@ -38,6 +50,7 @@ class CommandRegistry:
             if normalized in self._commands or normalized in self._aliases:
                 raise ValueError(f"Command alias already registered: {normalized}")
             self._aliases[normalized] = name
+            self._aliases_by_command.setdefault(name, []).append(normalized)
 
     def unregister(self, name: str) -> bool:
         normalized = name.strip().lower()
@@ -45,9 +58,9 @@ class CommandRegistry:
         if resolved is None:
             return False
         del self._commands[resolved]
-        alias_keys = [key for key, value in self._aliases.items() if value == resolved]
-        for key in alias_keys:
+        for key in self._aliases_by_command.pop(resolved, ()):
             del self._aliases[key]
+        self._invalidate()
         return True
 
     def unregister_by_source(self, source: str) -> int:
@@ -75,12 +88,17 @@ class CommandRegistry:
             return None
         return self._commands[resolved]
 
+    def _names(self) -> tuple[str, ...]:
+        if self._sorted_names is None:
+            self._sorted_names = tuple(sorted(self._commands))
+        return self._sorted_names
+
     def command_names(self) -> list[str]:
-        return sorted(self._commands.keys())
+        return list(self._names())
 
     def help_rows(self) -> list[tuple[str, str, str | None]]:
         rows = []
-        for name in self.command_names():
+        for name in self._names():
             command = self._commands[name]
             alias_suffix = ""
             if command.aliases:
@@ -88,14 +106,31 @@ class CommandRegistry:
             rows.append((f"/{name}{alias_suffix}", command.help_text, command.usage))
         return rows
 
+    def formatted_help(self) -> str:
+        """The ``/help`` listing, built once per change to the command set."""
+        if self._help_text is None:
+            lines = ["Available commands:"]
+            for name, help_text, usage in self.help_rows():
+                if usage:
+                    lines.append(f"  {name}: {help_text} | usage: {usage}")
+                else:
+                    lines.append(f"  {name}: {help_text}")
+            self._help_text = "\n".join(lines)
+        return self._help_text
+
     def parse(self, text: str) -> ParsedCommand | None:
         raw = text.strip()
         if not raw.startswith("/"):
             return None
-        try:
-            parts = shlex.split(raw)
-        except ValueError as exc:
-            raise ValueError(f"Command parse error: {exc}") from exc
+        if raw.isprintable() and not any(char in raw for char in _SHLEX_SPECIAL):
+            # No quoting and no whitespace besides plain spaces (isprintable
+            # rules out tabs and the like), so shlex would split the same way.
+            parts = raw.split()
+        else:
+            try:
+                parts = shlex.split(raw)
+            except ValueError as exc:
+                raise ValueError(f"Command parse error: {exc}") from exc
         if not parts:
             return None
         head = parts[0].strip()
@@ -113,5 +148,13 @@ class CommandRegistry:
         if " " in text:
             return []
         prefix = text[1:].lower()
-        return [f"/{name}" for name in self.command_names() if name.startswith(prefix)]
+        # Names sharing a prefix are contiguous in sorted order: start at the
+        # first candidate and stop at the first name that no longer matches.
+        names = self._names()
+        matches = []
+        for index in range(bisect.bisect_left(names, prefix), len(names)):
+            if not names[index].startswith(prefix):
+                break
+            matches.append(f"/{names[index]}")
+        return matches
 
@@ -3,14 +3,23 @@
 from __future__ import annotations
 
 import threading
+import time
 from concurrent.futures import Future, ThreadPoolExecutor
-from dataclasses import replace
-from queue import Queue
+from dataclasses import fields
+from operator import attrgetter
+from queue import Empty, SimpleQueue
 from typing import Any, Callable
 from uuid import uuid4
 
 from .types import JobEvent, JobInfo, utc_now_iso
 
+_JOB_FIELDS = attrgetter(*(item.name for item in fields(JobInfo)))
+
+
+def _snapshot(job: JobInfo) -> JobInfo:
+    """Copy ``job`` for callers; several times cheaper than ``dataclasses.replace``."""
+    return JobInfo(*_JOB_FIELDS(job))
+
 
 class JobContext:
     """Context object passed to background tasks."""
@@ -31,84 +40,100 @@ class JobContext:
 class JobManager:
     """Thread-backed job manager with pollable event stream."""
 
+    # A progress update close to the last one emitted for the same job (same
+    # message, small step, within the interval) only updates the JobInfo, so
+    # a task reporting from a tight loop cannot flood the event queue.
+    PROGRESS_EVENT_INTERVAL_NS = 20_000_000
+    PROGRESS_EVENT_MIN_STEP = 0.005
+    # Finished jobs beyond this many are forgotten, oldest first.
+    MAX_JOBS = 1024
+
     def __init__(self, max_workers: int = 2) -> None:
         self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="codeclaw-tui")
         self._lock = threading.Lock()
         self._jobs: dict[str, JobInfo] = {}
         self._futures: dict[str, Future] = {}
         self._cancel_events: dict[str, threading.Event] = {}
-        self._events: Queue[JobEvent] = Queue()
+        self._last_progress: dict[str, tuple[int, float, str]] = {}
+        self._events: SimpleQueue[JobEvent] = SimpleQueue()
 
     def submit(self, name: str, fn: Callable[[JobContext], Any]) -> JobInfo:
         job_id = uuid4().hex[:8]
         created = utc_now_iso()
         info = JobInfo(id=job_id, name=name, status="queued", created_at=created, message="queued")
+        # The stored JobInfo is mutated by the worker; hand back the queued state.
+        snapshot = _snapshot(info)
         cancel_event = threading.Event()
         with self._lock:
             self._jobs[job_id] = info
             self._cancel_events[job_id] = cancel_event
+            if len(self._jobs) > self.MAX_JOBS:
+                self._evict_finished_job()
         self._events.put(JobEvent(job_id=job_id, kind="queued", message=f"{name} queued"))
         future = self._executor.submit(self._run_job, job_id, fn)
+        # A single dict store is atomic, and readers only look the future up
+        # with .get() (a job without one yet simply cannot be cancelled), so
+        # this needs no second trip through the lock.
+        self._futures[job_id] = future
+        # Runs once the job finished or was cancelled before starting (at once
+        # if that already happened), so per-job bookkeeping doesn't pile up.
+        future.add_done_callback(lambda _future: self._forget_job_handles(job_id))
+        return snapshot
+
+    def _forget_job_handles(self, job_id: str) -> None:
         with self._lock:
-            self._futures[job_id] = future
-        return replace(info)
+            self._futures.pop(job_id, None)
+            self._cancel_events.pop(job_id, None)
+            self._last_progress.pop(job_id, None)
+
+    def _evict_finished_job(self) -> None:
+        # _jobs is in submission order, so the oldest finished job comes first.
+        for job_id, job in self._jobs.items():
+            if job.status in {"success", "error", "cancelled"}:
+                del self._jobs[job_id]
+                return
 
     def _run_job(self, job_id: str, fn: Callable[[JobContext], Any]) -> None:
         cancel_event = self._cancel_events[job_id]
+        started = utc_now_iso()
         with self._lock:
             job = self._jobs[job_id]
-            self._jobs[job_id] = replace(
-                job,
-                status="running",
-                started_at=utc_now_iso(),
-                message="running",
-            )
+            job.status = "running"
+            job.started_at = started
+            job.message = "running"
         self._events.put(JobEvent(job_id=job_id, kind="started", message="started", progress=0.0))
 
         ctx = JobContext(job_id=job_id, manager=self, cancel_event=cancel_event)
         try:
             result = fn(ctx)
+            finished = utc_now_iso()
             if cancel_event.is_set():
                 with self._lock:
                     job = self._jobs[job_id]
-                    self._jobs[job_id] = replace(
-                        job,
-                        status="cancelled",
-                        finished_at=utc_now_iso(),
-                        message="cancelled",
-                    )
+                    job.status = "cancelled"
+                    job.finished_at = finished
+                    job.message = "cancelled"
                 self._events.put(JobEvent(job_id=job_id, kind="cancelled", message="cancelled", progress=1.0))
                 return
 
             with self._lock:
                 job = self._jobs[job_id]
-                self._jobs[job_id] = replace(
-                    job,
-                    status="success",
-                    finished_at=utc_now_iso(),
-                    progress=1.0,
-                    message="completed",
-                )
+                job.status = "success"
+                job.finished_at = finished
+                job.progress = 1.0
+                job.message = "completed"
             payload = {"result": result} if result is not None else {}
             self._events.put(JobEvent(job_id=job_id, kind="success", message="completed", progress=1.0, payload=payload))
         except Exception as exc:
+            finished = utc_now_iso()
+            error = f"{type(exc).__name__}: {exc}"
             with self._lock:
                 job = self._jobs[job_id]
-                self._jobs[job_id] = replace(
-                    job,
-                    status="error",
-                    finished_at=utc_now_iso(),
-                    message="failed",
-                    error=f"{type(exc).__name__}: {exc}",
-                )
-            self._events.put(
-                JobEvent(
-                    job_id=job_id,
-                    kind="error",
-                    message=f"{type(exc).__name__}: {exc}",
-                    progress=1.0,
-                )
-            )
+                job.status = "error"
+                job.finished_at = finished
+                job.message = "failed"
+                job.error = error
+            self._events.put(JobEvent(job_id=job_id, kind="error", message=error, progress=1.0))
 
     def _update_progress(self, job_id: str, value: float, message: str) -> None:
         pct = max(0.0, min(1.0, float(value)))
@@ -116,23 +141,44 @@ class JobManager:
             job = self._jobs.get(job_id)
             if job is None:
                 return
-            self._jobs[job_id] = replace(job, progress=pct, message=message or job.message)
+            job.progress = pct
+            if message:
+                job.message = message
+            now = time.monotonic_ns()
+            last = self._last_progress.get(job_id)
+            if (
+                last is not None
+                and 0.0 < pct < 1.0
+                and now - last[0] < self.PROGRESS_EVENT_INTERVAL_NS
+                and abs(pct - last[1]) < self.PROGRESS_EVENT_MIN_STEP
+                and message == last[2]
+            ):
+                return
+            self._last_progress[job_id] = (now, pct, message)
         self._events.put(JobEvent(job_id=job_id, kind="progress", message=message, progress=pct))
 
-    def poll_events(self) -> list[JobEvent]:
+    def poll_events(self, timeout: float = 0.0) -> list[JobEvent]:
+        """Drain pending events, waiting up to ``timeout`` seconds for the first."""
         items: list[JobEvent] = []
-        while not self._events.empty():
-            items.append(self._events.get_nowait())
+        try:
+            if timeout > 0:
+                items.append(self._events.get(timeout=timeout))
+            while True:
+                items.append(self._events.get_nowait())
+        except Empty:
+            pass
         return items
 
     def list_jobs(self) -> list[JobInfo]:
         with self._lock:
-            return [replace(job) for job in sorted(self._jobs.values(), key=lambda item: item.created_at)]
+            jobs = [_snapshot(job) for job in self._jobs.values()]
+        jobs.sort(key=lambda item: item.created_at)
+        return jobs
 
     def get_job(self, job_id: str) -> JobInfo | None:
         with self._lock:
             job = self._jobs.get(job_id)
-            return replace(job) if job is not None else None
+            return _snapshot(job) if job is not None else None
 
     def cancel(self, job_id: str) -> bool:
         with self._lock:
@@ -143,21 +189,22 @@ class JobManager:
                 return False
             if job.status in {"success", "error", "cancelled"}:
                 return False
-            cancelled = future.cancel()
-            if cancelled:
-                self._jobs[job_id] = replace(
-                    job,
-                    status="cancelled",
-                    cancel_requested=True,
-                    finished_at=utc_now_iso(),
-                    message="cancelled before start",
-                )
-                self._events.put(JobEvent(job_id=job_id, kind="cancelled", message="cancelled before start"))
-                return True
-            cancel_event.set()
-            self._jobs[job_id] = replace(job, cancel_requested=True, message="cancellation requested")
-            self._events.put(JobEvent(job_id=job_id, kind="cancelling", message="cancellation requested"))
+            job.cancel_requested = True
+            job.message = "cancellation requested"
+        # Future.cancel takes the executor's own lock; don't hold ours across it.
+        if future.cancel():
+            finished = utc_now_iso()
+            with self._lock:
+                if job.status == "cancelled":
+                    return False  # a concurrent cancel() got here first
+                job.status = "cancelled"
+                job.finished_at = finished
+                job.message = "cancelled before start"
+            self._events.put(JobEvent(job_id=job_id, kind="cancelled", message="cancelled before start"))
             return True
+        cancel_event.set()
+        self._events.put(JobEvent(job_id=job_id, kind="cancelling", message="cancellation requested"))
+        return True
 
     def active_count(self) -> int:
         with self._lock:
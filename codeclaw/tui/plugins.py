@@ -3,16 +3,22 @@
 from __future__ import annotations
 
 import importlib.util
-import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 from types import ModuleType
 from typing import Callable
 
-from ..config import load_config, save_config
+from ..config import config_path, load_config, save_config
+from ..source_adapters import _loads_json
 from .commands import CommandRegistry
 from .types import SlashCommand
 
+# Plugin entrypoints are imported on a small thread pool when several need
+# loading at once; register(ctx) still runs serially, in discovery order.
+_PLUGIN_IMPORT_WORKERS = 4
+
 
 @dataclass
 class PluginRecord:
@@ -27,6 +33,8 @@ class PluginRecord:
     description: str = ""
     error: str | None = None
     registered_commands: list[str] = field(default_factory=list)
+    # Membership index for registered_commands, which keeps registration order.
+    _registered_set: set[str] = field(default_factory=set, init=False, repr=False, compare=False)
 
 
 class PluginContext:
@@ -72,7 +80,13 @@ class PluginManager:
         self.emit = emit
         self.plugin_dirs = plugin_dirs or []
         self.records: dict[str, PluginRecord] = {}
+        # Normalized plugin name -> key in ``records``; the first record wins.
+        self._by_norm: dict[str, str] = {}
         self._modules: dict[str, ModuleType] = {}
+        # Manifest path -> (signature when loaded, record) for incremental reloads.
+        self._plugin_state: dict[Path, tuple[tuple, PluginRecord]] = {}
+        self._disabled_cache: set[str] | None = None
+        self._disabled_stamp: tuple[int, int] | None = None
 
     @staticmethod
     def _normalize_plugin_name(name: str) -> str:
@@ -85,21 +99,32 @@ class PluginManager:
             Path.home() / ".codeclaw" / "plugins",
         ]
 
-    def _disabled_plugins(self) -> set[str]:
-        cfg = load_config()
+    @staticmethod
+    def _config_stamp() -> tuple[int, int] | None:
+        try:
+            stat = config_path().stat()
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _parse_disabled(self, cfg: dict) -> set[str]:
         return {
             self._normalize_plugin_name(str(name))
             for name in cfg.get("disabled_plugins", [])
             if str(name).strip()
         }
 
+    def _disabled_plugins(self) -> set[str]:
+        """Disabled plugin names, re-read only when the config file changes on disk."""
+        stamp = self._config_stamp()
+        if self._disabled_cache is None or stamp != self._disabled_stamp:
+            self._disabled_cache = self._parse_disabled(load_config())
+            self._disabled_stamp = stamp
+        return self._disabled_cache
+
     def _set_plugin_enabled(self, name: str, enabled: bool) -> None:
         cfg = load_config()
-        disabled = {
-            self._normalize_plugin_name(str(item))
-            for item in cfg.get("disabled_plugins", [])
-            if str(item).strip()
-        }
+        disabled = self._parse_disabled(cfg)
         normalized = self._normalize_plugin_name(name)
         if enabled:
             disabled.discard(normalized)
@@ -107,41 +132,48 @@ class PluginManager:
             disabled.add(normalized)
         cfg["disabled_plugins"] = sorted(disabled)
         save_config(cfg)
+        # What was just saved is current; the reload that follows needn't re-read it.
+        self._disabled_cache = disabled
+        self._disabled_stamp = self._config_stamp()
 
     def _find_record(self, name: str) -> PluginRecord | None:
-        needle = self._normalize_plugin_name(name)
-        for record in self.records.values():
-            if self._normalize_plugin_name(record.name) == needle:
-                return record
-        return None
+        key = self._by_norm.get(self._normalize_plugin_name(name))
+        return self.records.get(key) if key is not None else None
+
+    def _add_record(self, record: PluginRecord) -> None:
+        self.records[record.name] = record
+        self._by_norm.setdefault(self._normalize_plugin_name(record.name), record.name)
 
     def enable(self, name: str) -> bool:
         self._set_plugin_enabled(name, True)
-        self.reload()
+        self.reload(changed_only=True)
         record = self._find_record(name)
         return bool(record and record.enabled and record.loaded and not record.error)
 
     def disable(self, name: str) -> bool:
         self._set_plugin_enabled(name, False)
-        self.reload()
+        self.reload(changed_only=True)
         record = self._find_record(name)
         return bool(record and not record.enabled)
 
     def _iter_plugin_manifests(self) -> list[Path]:
         manifests: list[Path] = []
         for root in self.plugin_dirs:
-            if not root.exists() or not root.is_dir():
+            # scandir reports entry types from the directory listing itself,
+            # so only the manifest check costs a stat per plugin directory.
+            try:
+                with os.scandir(root) as entries:
+                    children = sorted(entry.name for entry in entries if entry.is_dir())
+            except OSError:
                 continue
-            for child in sorted(root.iterdir()):
-                if not child.is_dir():
-                    continue
-                manifest = child / "plugin.json"
+            for name in children:
+                manifest = root / name / "plugin.json"
                 if manifest.exists():
                     manifests.append(manifest)
         return manifests
 
     def _load_manifest(self, path: Path) -> dict[str, str]:
-        parsed = json.loads(path.read_text(encoding="utf-8"))
+        parsed = _loads_json(path.read_bytes())
         if not isinstance(parsed, dict):
             raise ValueError("plugin.json must be a JSON object.")
         name = str(parsed.get("name", "")).strip()
@@ -170,59 +202,177 @@ class PluginManager:
 
     def _register_plugin_command(self, plugin_name: str, command_name: str) -> None:
         record = self.records.get(plugin_name)
-        if record is None:
-            return
-        if command_name not in record.registered_commands:
+        if record is not None and command_name not in record._registered_set:
+            record._registered_set.add(command_name)
             record.registered_commands.append(command_name)
 
-    def reload(self) -> list[PluginRecord]:
-        for name in list(self.records):
-            self.registry.unregister_by_source(f"plugin:{name}")
-        self.records = {}
-        self._modules = {}
+    @staticmethod
+    def _file_stamp(path: Path) -> tuple[int, int] | None:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _plugin_signature(self, manifest: Path, record: PluginRecord, enabled: bool) -> tuple:
+        return (self._file_stamp(manifest), self._file_stamp(Path(record.entrypoint)), enabled)
+
+    def _unchanged_records(
+        self,
+        manifests: list[Path],
+        parsed: dict[Path, dict[str, str] | Exception],
+        disabled: set[str],
+    ) -> dict[Path, PluginRecord]:
+        """Records that can stay loaded: same manifest, entrypoint and enabled state.
 
+        A record is only kept while it is still the first plugin with its name,
+        so a changed manifest elsewhere cannot turn it into a duplicate.
+        """
+        reused: dict[Path, PluginRecord] = {}
+        seen: set[str] = set()
+        for manifest in manifests:
+            data = parsed[manifest]
+            name = data["name"] if isinstance(data, dict) else manifest.parent.name
+            key = self._normalize_plugin_name(name)
+            known = self._plugin_state.get(manifest)
+            if known is not None and key not in seen:
+                signature, record = known
+                if record.name == name and signature == self._plugin_signature(manifest, record, key not in disabled):
+                    reused[manifest] = record
+            seen.add(key)
+        return reused
+
+    def reload(self, changed_only: bool = False) -> list[PluginRecord]:
+        """Rediscover plugins and (re)load them.
+
+        With ``changed_only``, plugins whose manifest, entrypoint and enabled
+        state are unchanged since they last loaded keep their module and
+        commands; everything else is unloaded and loaded again.
+        """
         disabled = self._disabled_plugins()
-        for manifest in self._iter_plugin_manifests():
+        manifests = self._iter_plugin_manifests()
+        parsed: dict[Path, dict[str, str] | Exception] = {}
+        for manifest in manifests:
             try:
-                data = self._load_manifest(manifest)
-                plugin_name = data["name"]
-                plugin_key = self._normalize_plugin_name(plugin_name)
-                if any(self._normalize_plugin_name(existing) == plugin_key for existing in self.records):
-                    raise ValueError(f"Duplicate plugin name detected: {plugin_name}")
-                plugin_root = manifest.parent
-                entrypoint = plugin_root / data["entrypoint"]
-                enabled = plugin_key not in disabled
-                record = PluginRecord(
-                    name=plugin_name,
-                    version=data["version"],
-                    path=plugin_root,
-                    enabled=enabled,
-                    loaded=False,
-                    entrypoint=str(entrypoint),
-                    description=data["description"],
-                )
-                self.records[plugin_name] = record
-                if not enabled:
-                    continue
-                if not entrypoint.exists():
-                    raise FileNotFoundError(f"Plugin entrypoint not found: {entrypoint}")
-                module = self._load_module(plugin_name, entrypoint)
-                register_fn = getattr(module, "register", None)
-                if not callable(register_fn):
-                    raise AttributeError("Plugin entrypoint must define register(ctx).")
-                ctx = PluginContext(self, plugin_name=plugin_name)
-                register_fn(ctx)
-                record.loaded = True
-                self._modules[plugin_name] = module
-                self.emit(
-                    f"Loaded plugin '{plugin_name}' (commands: {', '.join(record.registered_commands) or 'none'})",
-                    level="info",
-                )
+                parsed[manifest] = self._load_manifest(manifest)
             except Exception as exc:
-                fallback_name = manifest.parent.name
-                existing = self.records.get(fallback_name)
-                if existing is None:
-                    self.records[fallback_name] = PluginRecord(
+                parsed[manifest] = exc
+        reused = self._unchanged_records(manifests, parsed, disabled) if changed_only else {}
+
+        kept = {record.name for record in reused.values()}
+        for name in self.records:
+            if name not in kept:
+                self.registry.unregister_by_source(f"plugin:{name}")
+                self._modules.pop(name, None)
+        previous_state = self._plugin_state
+        self.records = {}
+        self._by_norm = {}
+        self._plugin_state = {}
+
+        modules = self._import_modules(manifests, parsed, disabled, reused)
+        for manifest in manifests:
+            record = reused.get(manifest)
+            if record is not None and self._normalize_plugin_name(record.name) not in self._by_norm:
+                self._add_record(record)
+                self._plugin_state[manifest] = previous_state[manifest]
+                continue
+            if record is not None:
+                self.registry.unregister_by_source(f"plugin:{record.name}")
+                self._modules.pop(record.name, None)
+            self._load_plugin(manifest, parsed[manifest], disabled, modules.get(manifest))
+
+        return self.list_records()
+
+    def _import_modules(
+        self,
+        manifests: list[Path],
+        parsed: dict[Path, dict[str, str] | Exception],
+        disabled: set[str],
+        reused: dict[Path, PluginRecord],
+    ) -> dict[Path, ModuleType | Exception]:
+        """Import the entrypoints ``_load_plugin`` is about to need, concurrently.
+
+        Returns nothing when fewer than two plugins need importing; those are
+        imported by ``_load_plugin`` itself.
+        """
+        pending: list[tuple[Path, str, Path]] = []
+        seen: set[str] = set()
+        for manifest in manifests:
+            data = parsed[manifest]
+            name = data["name"] if isinstance(data, dict) else manifest.parent.name
+            key = self._normalize_plugin_name(name)
+            if isinstance(data, dict) and key not in seen and key not in disabled and manifest not in reused:
+                entrypoint = manifest.parent / data["entrypoint"]
+                if entrypoint.exists():
+                    pending.append((manifest, name, entrypoint))
+            seen.add(key)
+        if len(pending) < 2:
+            return {}
+
+        def _import(item: tuple[Path, str, Path]) -> ModuleType | Exception:
+            try:
+                return self._load_module(item[1], item[2])
+            except Exception as exc:
+                return exc
+
+        workers = min(_PLUGIN_IMPORT_WORKERS, len(pending))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="codeclaw-plugins") as executor:
+            return {item[0]: module for item, module in zip(pending, executor.map(_import, pending))}
+
+    def _load_plugin(
+        self,
+        manifest: Path,
+        data: dict[str, str] | Exception,
+        disabled: set[str],
+        module: ModuleType | Exception | None = None,
+    ) -> None:
+        try:
+            if isinstance(data, Exception):
+                raise data
+            plugin_name = data["name"]
+            plugin_key = self._normalize_plugin_name(plugin_name)
+            if plugin_key in self._by_norm:
+                raise ValueError(f"Duplicate plugin name detected: {plugin_name}")
+            plugin_root = manifest.parent
+            entrypoint = plugin_root / data["entrypoint"]
+            enabled = plugin_key not in disabled
+            record = PluginRecord(
+                name=plugin_name,
+                version=data["version"],
+                path=plugin_root,
+                enabled=enabled,
+                loaded=False,
+                entrypoint=str(entrypoint),
+                description=data["description"],
+            )
+            self._add_record(record)
+            if not enabled:
+                self._plugin_state[manifest] = (self._plugin_signature(manifest, record, enabled), record)
+                return
+            if not entrypoint.exists():
+                raise FileNotFoundError(f"Plugin entrypoint not found: {entrypoint}")
+            if module is None:
+                module = self._load_module(plugin_name, entrypoint)
+            elif isinstance(module, Exception):
+                raise module
+            register_fn = getattr(module, "register", None)
+            if not callable(register_fn):
+                raise AttributeError("Plugin entrypoint must define register(ctx).")
+            ctx = PluginContext(self, plugin_name=plugin_name)
+            register_fn(ctx)
+            record.loaded = True
+            self._modules[plugin_name] = module
+            self._plugin_state[manifest] = (self._plugin_signature(manifest, record, enabled), record)
+            self.emit(
+                f"Loaded plugin '{plugin_name}' (commands: {', '.join(record.registered_commands) or 'none'})",
+                level="info",
+            )
+        except Exception as exc:
+            fallback_name = manifest.parent.name
+            existing = self.records.get(fallback_name)
+            if existing is None:
+                self._add_record(
+                    PluginRecord(
                         name=fallback_name,
                         version="unknown",
                         path=manifest.parent,
@@ -231,14 +381,13 @@ class PluginManager:
                         entrypoint=str(manifest.parent / "plugin.py"),
                         error=f"{type(exc).__name__}: {exc}",
                     )
-                else:
-                    existing.error = f"{type(exc).__name__}: {exc}"
-                self.emit(
-                    f"Plugin load failed ({manifest.parent.name}): {type(exc).__name__}: {exc}",
-                    level="error",
                 )
-
-        return self.list_records()
+            else:
+                existing.error = f"{type(exc).__name__}: {exc}"
+            self.emit(
+                f"Plugin load failed ({manifest.parent.name}): {type(exc).__name__}: {exc}",
+                level="error",
+            )
 
     def list_records(self) -> list[PluginRecord]:
         return [self.records[name] for name in sorted(self.records)]
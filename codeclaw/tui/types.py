@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any, Callable
@@ -35,7 +36,7 @@ class SlashCommand:
     source: str = "builtin"
 
 
-@dataclass
+@dataclass(slots=True)
 class JobEvent:
     """One event emitted by the background job manager."""
 
@@ -44,10 +45,15 @@ class JobEvent:
     message: str = ""
     progress: float | None = None
     payload: dict[str, Any] = field(default_factory=dict)
-    created_at: str = field(default_factory=utc_now_iso)
+    created_at_ns: int = field(default_factory=time.time_ns)
 
+    @property
+    def created_at(self) -> str:
+        # Formatted on demand: progress events are created far more often than read.
+        return datetime.fromtimestamp(self.created_at_ns / 1e9, tz=timezone.utc).isoformat()
 
-@dataclass
+
+@dataclass(slots=True)
 class JobInfo:
     """Current snapshot of a background job."""
 
@@ -188,6 +188,20 @@ class TestAnonymizer:
         result = anon.text("by github_handle on GitHub")
         assert "github_handle" not in result
 
+    def test_text_many_matches_text(self, monkeypatch):
+        monkeypatch.setattr(
+            "codeclaw.anonymizer._detect_home_dir",
+            lambda: ("/Users/testuser", "testuser"),
+        )
+        anon = Anonymizer(extra_usernames=["GitHub_Handle"])
+        texts = [
+            "Hello testuser, your home is /Users/testuser",
+            "",
+            "cd -Users-testuser-proj by github_handle",
+            "nothing to see",
+        ]
+        assert anon.text_many(texts) == [anon.text(t) for t in texts]
+
     def test_extra_usernames_dedup(self, monkeypatch):
         monkeypatch.setattr(
             "codeclaw.anonymizer._detect_home_dir",
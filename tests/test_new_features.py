@@ -215,6 +215,67 @@ def test_external_adapter_discovery(monkeypatch, tmp_path):
     assert any(project["source"] == "cursor" for project in projects)
 
 
+def test_external_adapter_discovery_nested_sizes(monkeypatch, tmp_path):
+    home = tmp_path / "home"
+    nested = home / ".zed" / "sessions" / "team" / "project-b"
+    nested.mkdir(parents=True)
+    (nested / "a.jsonl").write_text("x" * 10, encoding="utf-8")
+    (nested / "b.json").write_text("y" * 5, encoding="utf-8")
+    (nested / "notes.txt").write_text("ignored", encoding="utf-8")
+
+    monkeypatch.setattr(source_adapters, "_home", lambda: home)
+    projects = [p for p in source_adapters.discover_external_projects() if p["source"] == "zed"]
+    assert projects == [
+        {
+            "dir_name": str(nested),
+            "display_name": "zed:project-b",
+            "session_count": 2,
+            "total_size_bytes": 15,
+            "source": "zed",
+            "adapter_tier": source_adapters.EXPERIMENTAL,
+        }
+    ]
+
+
+def test_adapter_roots_follow_home(monkeypatch, tmp_path):
+    monkeypatch.setattr(source_adapters, "_home", lambda: tmp_path / "a")
+    first = source_adapters._adapter_roots()
+    assert source_adapters._adapter_roots() is first
+    monkeypatch.setattr(source_adapters, "_home", lambda: tmp_path / "b")
+    assert source_adapters._adapter_roots()["cursor"].roots == (tmp_path / "b" / ".cursor" / "sessions",)
+
+
+def test_external_session_parse_stats(tmp_path):
+    project = tmp_path / "project-a"
+    project.mkdir()
+    (project / "s1.jsonl").write_bytes(
+        b'{"role":"user","content":"fix the bug please","timestamp":1}\n'
+        b"not json\n"
+        b"\n"
+        b'{"role":"assistant","content":"done \xff"}\n'
+    )
+    (project / "s2.json").write_text(
+        json.dumps({"messages": [{"role": "assistant", "content": "hi", "tool_uses": [{"tool": "bash"}]}]}),
+        encoding="utf-8",
+    )
+
+    class _Identity:
+        def text(self, value):
+            return value
+
+    sessions = source_adapters.parse_external_project_sessions("cursor", str(project), _Identity())
+    assert [s["session_id"] for s in sessions] == ["s1", "s2"]
+    assert sessions[0]["messages"][1]["content"] == "done \ufffd"
+    assert sessions[0]["stats"] == {
+        "user_messages": 1,
+        "assistant_messages": 1,
+        "tool_uses": 0,
+        "input_tokens": 4,
+        "output_tokens": 2,
+    }
+    assert sessions[1]["stats"]["tool_uses"] == 1
+
+
 def test_push_to_hf_writes_version_manifest(monkeypatch, tmp_path):
     jsonl_path = tmp_path / "data.jsonl"
     jsonl_path.write_text(
@@ -389,8 +450,8 @@ def test_maybe_encrypt_file_auto_initializes_key(monkeypatch, tmp_path):
         lambda _cfg=None: (True, "file:default", "file"),
     )
     monkeypatch.setattr(
-        "codeclaw.storage.encrypt_text",
-        lambda plain, config=None: "CODECLAW_ENCRYPTED_V1:token",
+        "codeclaw.storage.encrypt_framed_text",
+        lambda plain, config=None: "CODECLAW_ENCRYPTED_V3:token",
     )
 
     assert maybe_encrypt_file(file_path, config=config) is True
@@ -2,7 +2,12 @@
 
 import pytest
 
-from codeclaw.redactor import redact_all_sessions
+from codeclaw.redactor import (
+    RedactionEngine,
+    extract_context_snippets,
+    redact_all_sessions,
+    redact_session_with_findings,
+)
 
 
 class TestRedactAllSessions:
@@ -34,3 +39,151 @@ class TestRedactAllSessions:
         result, count = redact_all_sessions(sessions, custom_strings=["alice@example.com"])
         # The email should be redacted
         assert count > 0
+
+    def test_large_batch_matches_sequential(self, monkeypatch):
+        import codeclaw.redactor as redactor
+
+        sessions = [
+            {"messages": [{"role": "user", "content": f"run {i} key sk-ant-{'A' * 20}{i}"}]}
+            for i in range(redactor._PARALLEL_REDACT_MIN_SESSIONS)
+        ]
+        monkeypatch.setattr(redactor.os, "cpu_count", lambda: 2)
+        result, count = redact_all_sessions(sessions, custom_strings=["run 3"])
+
+        monkeypatch.setattr(redactor, "_redact_in_processes", lambda *_: None)
+        expected, expected_count = redact_all_sessions(sessions, custom_strings=["run 3"])
+        assert result == expected
+        assert count == expected_count
+
+    def test_pool_does_not_fork(self, monkeypatch):
+        import codeclaw.redactor as redactor
+
+        contexts = []
+
+        class FakePool:
+            def __init__(self, max_workers, mp_context):
+                contexts.append(mp_context.get_start_method())
+
+            def __enter__(self):
+                raise OSError("stop here")
+
+            def __exit__(self, *exc):
+                return False
+
+        monkeypatch.setattr(redactor.os, "cpu_count", lambda: 2)
+        monkeypatch.setattr(redactor, "ProcessPoolExecutor", FakePool)
+        sessions = [{"messages": []}] * redactor._PARALLEL_REDACT_MIN_SESSIONS
+        assert redactor._redact_in_processes(sessions, None) is None
+        assert contexts and contexts[0] in {"forkserver", "spawn"}
+
+    def test_falls_back_when_pool_unavailable(self, monkeypatch):
+        import codeclaw.redactor as redactor
+
+        def broken_pool(*args, **kwargs):
+            raise OSError("no semaphores")
+
+        monkeypatch.setattr(redactor.os, "cpu_count", lambda: 2)
+        monkeypatch.setattr(redactor, "ProcessPoolExecutor", broken_pool)
+        sessions = [
+            {"messages": [{"role": "user", "content": "sk-ant-REDACTED"}]}
+        ] * redactor._PARALLEL_REDACT_MIN_SESSIONS
+        result, count = redact_all_sessions(sessions)
+        assert count == len(sessions)
+        assert all(s["messages"][0]["content"] == "[REDACTED]" for s in result)
+
+
+class TestRedactSessionWithFindings:
+    def test_regex_engine_count_matches_baseline(self):
+        session = {
+            "messages": [
+                {"role": "user", "content": "key sk-ant-REDACTED for Acme Corp"},
+            ]
+        }
+        _, base_count, _ = redact_session_with_findings(session, custom_strings=["Acme Corp"])
+        _, count, findings = redact_session_with_findings(
+            session,
+            custom_strings=["Acme Corp"],
+            engine=RedactionEngine(engine="regex"),
+        )
+        assert base_count == 2
+        assert count == base_count
+        assert [f["category"] for f in findings] == ["anthropic_key"]
+
+    def test_input_session_left_untouched(self):
+        key = "sk-ant-REDACTED"
+        session = {
+            "stats": {"user_messages": 1},
+            "messages": [
+                {"role": "user", "content": key, "tool_uses": [{"tool": "bash", "input": key}]},
+            ],
+        }
+        redacted, count, _ = redact_session_with_findings(session)
+        assert count == 2
+        assert session["messages"][0]["content"] == key
+        assert session["messages"][0]["tool_uses"][0]["input"] == key
+        assert redacted["messages"][0]["tool_uses"][0]["input"] == "[REDACTED]"
+        assert redacted["stats"] == session["stats"]
+
+
+class _FakeAnalyzer:
+    def __init__(self, spans):
+        self.spans = spans
+
+    def analyze(self, text, language):
+        results = []
+        for start, end in self.spans:
+            result = type("Result", (), {})()
+            result.start, result.end, result.score, result.entity_type = start, end, 0.9, "PERSON"
+            results.append(result)
+        return results
+
+
+class TestRedactionEngineMl:
+    def _engine(self, spans):
+        engine = RedactionEngine(engine="regex")
+        engine.engine = "auto"
+        engine._analyzer = _FakeAnalyzer(spans)
+        engine._ml_ready = True
+        return engine
+
+    def test_ml_backend_loaded_on_first_use(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(RedactionEngine, "_init_ml_backend", lambda self: calls.append(self))
+        engine = RedactionEngine()
+        assert calls == []
+        engine.scan("plain text")
+        assert calls == [engine]
+
+    def test_regex_engine_never_loads_ml(self):
+        engine = RedactionEngine(engine="regex")
+        engine.scan("plain text")
+        assert engine.ml_available is False
+        assert engine._analyzer is None
+
+    def test_ml_snippets_replaced_everywhere(self):
+        text = "Alice met Bob; later Alice left"
+        engine = self._engine([(0, 5), (10, 13), (21, 26)])
+        redacted, count, findings = engine.redact_text(text)
+        assert redacted == "[REDACTED:ML_PII] met [REDACTED:ML_PII]; later [REDACTED:ML_PII] left"
+        assert count == 2
+        assert [f.text for f in findings] == ["Alice", "Bob"]
+
+    def test_overlapping_ml_snippets_prefer_longest(self):
+        text = "Dr Alice Smith called"
+        engine = self._engine([(3, 8), (3, 14)])
+        redacted, count, _ = engine.redact_text(text)
+        assert redacted == "Dr [REDACTED:ML_PII] called"
+        assert count == 1
+
+
+class TestExtractContextSnippets:
+    def test_case_insensitive_match(self):
+        snippets = extract_context_snippets("see Secret-Value\nhere", "secret-value", window=4)
+        assert snippets == ["see Secret-Value her"]
+
+    def test_absent_needle(self):
+        assert extract_context_snippets("nothing to see", "token") == []
+
+    def test_non_ascii_case_folding(self):
+        # "ſ" (long s) matches "s" case-insensitively although lower() keeps it.
+        assert extract_context_snippets("ſecret", "secret", window=0) == ["ſecret"]
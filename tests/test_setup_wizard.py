@@ -15,6 +15,9 @@ class TestParseDatasetRepo:
     def test_full_url_with_trailing_slash(self):
         assert _parse_dataset_repo("https://huggingface.co/datasets/user/repo/") == "user/repo"
 
+    def test_uppercase_scheme_url(self):
+        assert _parse_dataset_repo("HTTPS://HuggingFace.co/datasets/user/repo") == "user/repo"
+
     def test_empty(self):
         assert _parse_dataset_repo("") is None
 
@@ -0,0 +1,358 @@
+"""Tests for codeclaw.storage — encrypted-at-rest artifact helpers."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from codeclaw import storage
+from codeclaw.storage import (
+    EncryptionError,
+    decrypt_text,
+    encrypt_bytes,
+    encrypt_text,
+    is_encrypted_bytes,
+    is_encrypted_file,
+    is_encrypted_text,
+    iter_jsonl,
+    read_jsonl,
+)
+
+
+@pytest.fixture
+def key_file(tmp_path, monkeypatch):
+    """Point the fallback key file at tmp_path and disable the OS keyring."""
+    path = tmp_path / ".codeclaw" / "encryption.key"
+    monkeypatch.setattr(storage, "_LOCAL_KEY_FILE", path)
+    monkeypatch.setattr(storage, "_load_keyring", lambda: None)
+    storage._invalidate_key_cache()
+    yield path
+    storage._invalidate_key_cache()
+
+
+CONFIG = {"encryption_key_ref": "file:default"}
+
+
+class TestKeyCache:
+    def test_key_read_once(self, key_file, monkeypatch):
+        storage._write_local_fallback_key("k" * 43)
+        reads = []
+        original = storage._read_local_fallback_key
+        monkeypatch.setattr(storage, "_read_local_fallback_key", lambda: reads.append(1) or original())
+
+        payloads = [encrypt_text(f"row {i}", config=CONFIG) for i in range(5)]
+        assert [decrypt_text(p, config=CONFIG) for p in payloads] == [f"row {i}" for i in range(5)]
+        assert len(reads) == 1
+
+    def test_new_key_invalidates_cache(self, key_file):
+        storage._write_local_fallback_key("a" * 43)
+        first = encrypt_text("hello", config=CONFIG)
+        storage._write_local_fallback_key("b" * 43)
+        assert decrypt_text(first, config=CONFIG) == first
+        second = encrypt_text("hello", config=CONFIG)
+        assert is_encrypted_text(second)
+        assert decrypt_text(second, config=CONFIG) == "hello"
+
+    def test_v1_key_derivation_is_stable(self):
+        # Existing V1 artifacts depend on this exact derivation.
+        assert storage._to_fernet_key("abc") == b"YWJjMDAwMDAwMDAwMDAwMDAwMDAwMDAwMDAwMDAwMDA="
+
+    def test_shared_cipher_is_thread_safe(self, key_file):
+        storage._write_local_fallback_key("t" * 43)
+        rows = [f"row {i} " * 50 for i in range(200)]
+
+        def roundtrip(row):
+            return decrypt_text(encrypt_text(row, config=CONFIG), config=CONFIG)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            assert list(executor.map(roundtrip, rows)) == rows
+        assert storage._aesgcm_for.cache_info().currsize == 1
+
+
+class TestEnvelope:
+    def test_new_payloads_use_v2(self, key_file):
+        storage._write_local_fallback_key("e" * 43)
+        payload = encrypt_text("secret data", config=CONFIG)
+        assert payload.startswith("CODECLAW_ENCRYPTED_V2:")
+        assert decrypt_text(payload, config=CONFIG) == "secret data"
+        assert encrypt_text("secret data", config=CONFIG) != payload
+
+    def test_encrypt_bytes_matches_text_envelope(self, key_file):
+        storage._write_local_fallback_key("y" * 43)
+        payload = encrypt_bytes("héllo".encode("utf-8"), config=CONFIG)
+        assert isinstance(payload, bytes) and storage.is_encrypted_bytes(payload)
+        assert decrypt_text(payload.decode("ascii"), config=CONFIG) == "héllo"
+
+    def test_encrypt_bytes_without_key_returns_input(self, key_file):
+        assert encrypt_bytes(b"plain", config=CONFIG) == b"plain"
+
+    def test_v1_payloads_still_decrypt(self, key_file):
+        from cryptography.fernet import Fernet
+
+        raw_key = "v" * 43
+        storage._write_local_fallback_key(raw_key)
+        token = Fernet(storage._to_fernet_key(raw_key)).encrypt(b"legacy").decode("ascii")
+        assert decrypt_text(f"CODECLAW_ENCRYPTED_V1:{token}", config=CONFIG) == "legacy"
+
+    def test_tampered_v2_payload_rejected(self, key_file):
+        storage._write_local_fallback_key("x" * 43)
+        payload = encrypt_text("secret data", config=CONFIG)
+        tampered = payload[:-4] + ("AAAA" if not payload.endswith("AAAA") else "BBBB")
+        assert decrypt_text(tampered, config=CONFIG) == tampered
+        with pytest.raises(EncryptionError):
+            decrypt_text(tampered, config=CONFIG, strict=True)
+
+
+class TestReadJsonl:
+    def test_plain_file_skips_blank_and_malformed_lines(self, tmp_path):
+        path = tmp_path / "rows.jsonl"
+        path.write_bytes(b'{"a": 1}\r\n\n  \nnot json\n{"b": "\xff"}\n[1, 2]')
+        assert read_jsonl(path) == [{"a": 1}, {"b": "\ufffd"}, [1, 2]]
+
+    def test_non_standard_json_falls_back_to_stdlib(self, tmp_path):
+        path = tmp_path / "rows.jsonl"
+        path.write_text('{"score": NaN}\n', encoding="utf-8")
+        rows = read_jsonl(path)
+        assert len(rows) == 1 and rows[0]["score"] != rows[0]["score"]
+
+    def test_concatenated_values_on_one_line(self, tmp_path):
+        path = tmp_path / "rows.jsonl"
+        path.write_text('{"a": 1} {"a": 2}{"a": 3}\n{"b": 1} trailing\n', encoding="utf-8")
+        assert read_jsonl(path) == [{"a": 1}, {"a": 2}, {"a": 3}]
+
+    def test_stdlib_fallback_without_orjson(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("codeclaw.source_adapters.orjson", None)
+        path = tmp_path / "rows.jsonl"
+        path.write_bytes(b'{"a": 1}\r\n\nnot json\n{"b": "\xff"} {"c": 2}\n[1, 2] x\n')
+        assert read_jsonl(path) == [{"a": 1}, {"b": "\ufffd"}, {"c": 2}]
+
+    def test_iter_jsonl_is_lazy(self, tmp_path):
+        path = tmp_path / "rows.jsonl"
+        path.write_text('{"a": 1}\n{"a": 2}\n', encoding="utf-8")
+        rows = iter_jsonl(path)
+        assert next(rows) == {"a": 1}
+        assert list(rows) == [{"a": 2}]
+
+    def test_encrypted_file(self, key_file, tmp_path):
+        storage._write_local_fallback_key("j" * 43)
+        path = tmp_path / "rows.jsonl"
+        path.write_text(encrypt_text('{"a": 1}\n\n{"b": 2}\n', config=CONFIG), encoding="utf-8")
+        assert read_jsonl(path, config=CONFIG) == [{"a": 1}, {"b": 2}]
+
+
+class TestPlainReads:
+    def test_plain_read_skips_key_lookup(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(storage, "_resolve_raw_key", lambda config=None: pytest.fail("key resolved"))
+        path = tmp_path / "notes.txt"
+        path.write_bytes(b"plain \xff text\n")
+        assert storage.read_text(path) == "plain \ufffd text\n"
+        assert is_encrypted_file(path) is False
+
+    def test_is_encrypted_file(self, key_file, tmp_path):
+        storage._write_local_fallback_key("f" * 43)
+        path = tmp_path / "rows.jsonl"
+        path.write_text(encrypt_text('{"a": 1}\n', config=CONFIG), encoding="utf-8")
+        assert is_encrypted_file(path) is True
+        assert storage.read_text(path, config=CONFIG) == '{"a": 1}\n'
+
+    def test_undecryptable_file_returned_as_is(self, key_file, tmp_path):
+        storage._write_local_fallback_key("g" * 43)
+        payload = encrypt_text("secret", config=CONFIG)
+        path = tmp_path / "notes.txt"
+        path.write_text(payload, encoding="utf-8")
+        storage._write_local_fallback_key("h" * 43)
+        assert storage.read_text(path, config=CONFIG) == payload
+        with pytest.raises(EncryptionError):
+            storage.read_text(path, config=CONFIG, strict=True)
+
+
+class TestFramedFiles:
+    ROWS = [{"i": i, "text": "x" * i} for i in range(40)]
+
+    def _write(self, path, monkeypatch):
+        monkeypatch.setattr(storage, "_FRAME_SIZE", 64)
+        plain = "".join(f'{{"i": {row["i"]}, "text": "{row["text"]}"}}\n' for row in self.ROWS)
+        payload = storage.encrypt_framed_text(plain, config=CONFIG)
+        path.write_text(payload, encoding="utf-8")
+        return plain, payload
+
+    def test_roundtrip_streams_rows(self, key_file, tmp_path, monkeypatch):
+        storage._write_local_fallback_key("s" * 43)
+        path = tmp_path / "rows.jsonl"
+        plain, payload = self._write(path, monkeypatch)
+        assert payload.startswith("CODECLAW_ENCRYPTED_V3:") and payload.count("\n") > 10
+        assert read_jsonl(path, config=CONFIG) == self.ROWS
+        assert storage.read_text(path, config=CONFIG) == plain
+
+    def test_small_payload_is_one_line(self, key_file):
+        storage._write_local_fallback_key("o" * 43)
+        payload = storage.encrypt_framed_text('{"a": 1}\n', config=CONFIG)
+        assert "\n" not in payload
+        assert decrypt_text(payload, config=CONFIG) == '{"a": 1}\n'
+
+    @pytest.mark.parametrize("mangle", [
+        lambda frames: frames[:-1],
+        lambda frames: [frames[0], frames[2], frames[1]] + frames[3:],
+        lambda frames: frames + [frames[-1]],
+    ], ids=["truncated", "reordered", "appended"])
+    def test_tampered_frames_rejected(self, key_file, tmp_path, monkeypatch, mangle):
+        storage._write_local_fallback_key("r" * 43)
+        path = tmp_path / "rows.jsonl"
+        _, payload = self._write(path, monkeypatch)
+        frames = payload[len("CODECLAW_ENCRYPTED_V3:"):].split("\n")
+        path.write_text("CODECLAW_ENCRYPTED_V3:" + "\n".join(mangle(frames)), encoding="utf-8")
+        with pytest.raises(EncryptionError):
+            read_jsonl(path, config=CONFIG, strict=True)
+        with pytest.raises(EncryptionError):
+            storage.read_text(path, config=CONFIG, strict=True)
+
+    @pytest.mark.parametrize("drop", [2, -1], ids=["middle", "last"])
+    def test_dropped_frame_warns_in_non_strict_reads(self, key_file, tmp_path, monkeypatch, caplog, drop):
+        storage._write_local_fallback_key("d" * 43)
+        path = tmp_path / "rows.jsonl"
+        _, payload = self._write(path, monkeypatch)
+        frames = payload[len("CODECLAW_ENCRYPTED_V3:"):].split("\n")
+        del frames[drop]
+        path.write_text("CODECLAW_ENCRYPTED_V3:" + "\n".join(frames), encoding="utf-8")
+
+        with caplog.at_level("WARNING", logger="codeclaw.storage"):
+            rows = read_jsonl(path, config=CONFIG)
+        assert len(rows) < len(self.ROWS)
+        assert rows == self.ROWS[:len(rows)]
+        assert [record.levelname for record in caplog.records] == ["WARNING"]
+        assert str(path) in caplog.text and "failed to decrypt" in caplog.text
+
+    def test_corrupted_frame_warns_in_non_strict_reads(self, key_file, tmp_path, monkeypatch, caplog):
+        storage._write_local_fallback_key("c" * 43)
+        path = tmp_path / "rows.jsonl"
+        _, payload = self._write(path, monkeypatch)
+        frames = payload[len("CODECLAW_ENCRYPTED_V3:"):].split("\n")
+        frames[3] = frames[3][:-8] + ("A" * 8 if not frames[3].endswith("A" * 8) else "B" * 8)
+        path.write_text("CODECLAW_ENCRYPTED_V3:" + "\n".join(frames), encoding="utf-8")
+
+        with caplog.at_level("WARNING", logger="codeclaw.storage"):
+            assert len(list(iter_jsonl(path, config=CONFIG))) < len(self.ROWS)
+        assert "frame 3 failed to decrypt" in caplog.text
+
+    def test_maybe_encrypt_file_writes_frames(self, key_file, tmp_path):
+        storage._write_local_fallback_key("m" * 43)
+        path = tmp_path / "rows.jsonl"
+        path.write_text('{"a": 1}\n{"b": 2}\n', encoding="utf-8")
+        assert storage.maybe_encrypt_file(path, config=dict(CONFIG, encryption_enabled=True))
+        assert path.read_text(encoding="utf-8").startswith("CODECLAW_ENCRYPTED_V3:")
+        assert read_jsonl(path, config=CONFIG) == [{"a": 1}, {"b": 2}]
+
+
+class TestOptionalImports:
+    def test_failed_import_not_retried(self, monkeypatch):
+        import builtins
+
+        attempts = []
+        real_import = builtins.__import__
+
+        def fake_import(name, *args, **kwargs):
+            if name == "keyring":
+                attempts.append(name)
+                raise ImportError(name)
+            return real_import(name, *args, **kwargs)
+
+        storage._load_keyring.cache_clear()
+        monkeypatch.setattr(builtins, "__import__", fake_import)
+        try:
+            assert storage._load_keyring() is None
+            assert storage._load_keyring() is None
+        finally:
+            storage._load_keyring.cache_clear()
+        assert attempts == ["keyring"]
+
+
+class TestPrefixChecks:
+    @pytest.mark.parametrize("value", ["", "C", "CODECLAW", "plain", "CODECLAW_ENCRYPTED_V9:x", " CODECLAW_ENCRYPTED_V2:x"])
+    def test_not_encrypted(self, value):
+        assert is_encrypted_text(value) is False
+        assert is_encrypted_bytes(value.encode()) is False
+
+    @pytest.mark.parametrize("version", [1, 2, 3])
+    def test_encrypted(self, version):
+        value = f"CODECLAW_ENCRYPTED_V{version}:token"
+        assert is_encrypted_text(value) is True
+        assert is_encrypted_bytes(value.encode()) is True
+
+
+class TestMaybeEncryptFiles:
+    def test_encrypts_each_file_once(self, key_file, tmp_path, monkeypatch):
+        storage._write_local_fallback_key("b" * 43)
+        paths = []
+        for i in range(6):
+            path = tmp_path / f"rows{i}.jsonl"
+            path.write_text(f'{{"i": {i}}}\n', encoding="utf-8")
+            paths.append(path)
+        statuses = []
+        original = storage.encryption_status
+        monkeypatch.setattr(storage, "encryption_status", lambda cfg: statuses.append(1) or original(cfg))
+
+        results = storage.maybe_encrypt_files(paths, config=dict(CONFIG, encryption_enabled=True), max_workers=3)
+        assert results == [True] * 6
+        assert len(statuses) == 1
+        for i, path in enumerate(paths):
+            assert is_encrypted_file(path)
+            assert read_jsonl(path, config=CONFIG) == [{"i": i}]
+
+    def test_disabled(self, tmp_path):
+        path = tmp_path / "rows.jsonl"
+        path.write_text("{}\n", encoding="utf-8")
+        assert storage.maybe_encrypt_files([path, path], config={"encryption_enabled": False}) == [False, False]
+        assert path.read_text(encoding="utf-8") == "{}\n"
+
+    def test_already_encrypted_file_left_alone(self, key_file, tmp_path, monkeypatch):
+        storage._write_local_fallback_key("q" * 43)
+        path = tmp_path / "rows.jsonl"
+        path.write_text(encrypt_text('{"a": 1}\n', config=CONFIG), encoding="utf-8")
+        before = path.read_bytes()
+        monkeypatch.setattr(storage, "read_text", lambda *a, **kw: pytest.fail("file was read"))
+        assert storage.maybe_encrypt_file(path, config=dict(CONFIG, encryption_enabled=True)) is True
+        assert storage.maybe_encrypt_files([path], config=dict(CONFIG, encryption_enabled=True)) == [True]
+        assert path.read_bytes() == before
+
+
+class TestWriteText:
+    def test_replaces_file_with_private_mode(self, tmp_path):
+        path = tmp_path / "nested" / "out.jsonl"
+        storage.write_text(path, "first\n")
+        storage.write_text(path, "second\n")
+        assert path.read_text(encoding="utf-8") == "second\n"
+        assert [p.name for p in path.parent.iterdir()] == ["out.jsonl"]
+        if storage.os.name != "nt":
+            assert path.stat().st_mode & 0o777 == 0o600
+
+    def test_failed_write_keeps_previous_contents(self, tmp_path, monkeypatch):
+        path = tmp_path / "out.jsonl"
+        storage.write_text(path, "original\n")
+
+        def broken_replace(src, dst):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(storage.os, "replace", broken_replace)
+        with pytest.raises(OSError):
+            storage.write_text(path, "partial")
+        assert path.read_text(encoding="utf-8") == "original\n"
+        assert [p.name for p in tmp_path.iterdir()] == ["out.jsonl"]
+
+
+class TestEnsureEncryptionKey:
+    def test_generates_file_key(self, key_file, monkeypatch):
+        monkeypatch.setattr(storage, "save_config", lambda cfg: None)
+        cfg = {}
+        assert storage.ensure_encryption_key(cfg) == (True, "file:default", "file")
+        raw_key = key_file.read_text(encoding="utf-8")
+        assert len(raw_key) == 43 and "=" not in raw_key
+        assert cfg["encryption_key_ref"] == "file:default"
+
+    def test_unchanged_key_ref_not_saved(self, key_file, monkeypatch):
+        saves = []
+        monkeypatch.setattr(storage, "save_config", lambda cfg: saves.append(dict(cfg)))
+        cfg = dict(CONFIG)
+        storage.ensure_encryption_key(cfg)  # no key yet: generated, ref unchanged
+        storage.ensure_encryption_key(cfg)  # key file present
+        assert saves == []
+        storage.ensure_encryption_key({})
+        assert saves == [CONFIG]
@@ -1,9 +1,16 @@
 from __future__ import annotations
 
+import json
+import threading
+from collections import deque
+
+import pytest
 from prompt_toolkit.input import DummyInput
 from prompt_toolkit.output import DummyOutput
 
 from codeclaw.tui.app import CodeClawTuiApp
+from codeclaw.tui.jobs import JobContext
+from codeclaw.tui.types import JobEvent, JobInfo, SlashCommand
 
 
 def _build_app(monkeypatch, tmp_path, source: str = "auto"):
@@ -89,3 +96,322 @@ def test_tui_source_command_updates_config(monkeypatch, tmp_path):
     bad = app._cmd_source(None, ["invalid-source"])
     assert bad.ok is False
     app.jobs.shutdown()
+
+
+def test_tui_status_bar_reuses_config_until_saved(monkeypatch, tmp_path):
+    app, cfg = _build_app(monkeypatch, tmp_path, source="auto")
+    loads = []
+    monkeypatch.setattr("codeclaw.tui.app.load_config", lambda: loads.append(1) or dict(cfg))
+    monkeypatch.setattr("codeclaw.tui.app.detect_current_project", lambda: None)
+    monkeypatch.setattr("codeclaw.tui.app.daemon_running", lambda: False)
+
+    for _ in range(5):
+        app._status_bar_fragments()
+    assert len(loads) == 1
+    assert app._current_project_label() == "all"
+
+    app._cmd_config(None, ["set", "connected_projects", '["alpha"]'])
+    assert app._current_project_label() == "alpha"
+    app.jobs.shutdown()
+
+
+def test_tui_cached_config_follows_redirected_config_file(monkeypatch, tmp_path, tmp_config):
+    app, cfg = _build_app(monkeypatch, tmp_path)
+    loads = []
+    monkeypatch.setattr("codeclaw.tui.app.load_config", lambda: loads.append(1) or dict(cfg))
+    tmp_config.parent.mkdir(parents=True, exist_ok=True)
+    tmp_config.write_text("{}", encoding="utf-8")
+
+    app._cached_config()
+    app._cached_config()
+    assert len(loads) == 1
+
+    tmp_config.write_text('{"source": "codex"}', encoding="utf-8")
+    app._cached_config()
+    assert len(loads) == 2
+    app.jobs.shutdown()
+
+
+def test_tui_status_bar_repaints_reuse_text_until_refresh(monkeypatch, tmp_path):
+    app, _cfg = _build_app(monkeypatch, tmp_path, source="auto")
+    monkeypatch.setattr("codeclaw.tui.app.detect_current_project", lambda: None)
+    probes = []
+    monkeypatch.setattr(app, "_probe_watch_state", lambda: probes.append(1))
+
+    first = app._status_bar_fragments()
+    for _ in range(10):
+        assert app._status_bar_fragments() == first
+    assert len(probes) == 1
+
+    app._set_result("sync done")
+    assert "last=sync done" in app._status_bar_fragments()[0][1]
+    assert len(probes) == 2
+    app.jobs.shutdown()
+
+
+def test_tui_feed_keeps_last_lines_in_text(monkeypatch, tmp_path):
+    app, _cfg = _build_app(monkeypatch, tmp_path, source="auto")
+    app._cmd_clear(None, [])
+    app.feed_lines = deque(maxlen=3)
+
+    for i in range(5):
+        app.emit_feed(f"line {i}\nmore {i}" if i == 3 else f"line {i}")
+    assert list(app.feed_lines) == ["[info] line 2", "[info] line 3\nmore 3", "[info] line 4"]
+    assert app.feed.text == "\n".join(app.feed_lines)
+
+    app._cmd_clear(None, [])
+    assert app.feed.text == "" and not app.feed_lines
+    app.emit_feed("fresh")
+    assert app.feed.text == "[info] fresh"
+    app.jobs.shutdown()
+
+
+def test_tui_job_events_flushed_in_one_batch(monkeypatch, tmp_path):
+    app, _cfg = _build_app(monkeypatch, tmp_path, source="auto")
+    app._cmd_clear(None, [])
+    app.feed_lines = deque(maxlen=4)
+    records = []
+    monkeypatch.setattr(app.logger, "info", lambda msg, extra: records.append(extra["payload"]))
+    events = [
+        JobEvent(job_id="j1", kind="started", message="started"),
+        JobEvent(job_id="j1", kind="progress", message="half", progress=0.5),
+        JobEvent(job_id="j1", kind="success", message="completed", payload={"result": {"stdout": "out", "exit_code": 2}}),
+    ]
+    monkeypatch.setattr(app.jobs, "poll_events", lambda: events)
+
+    assert app._drain_job_events() is True
+    assert list(app.feed_lines) == [
+        "[info] job j1 progress: 50% half",
+        "[ok] job j1 completed",
+        "[info] out",
+        "[error] job j1 exited with code 2",
+    ]
+    assert app.feed.text == "\n".join(app.feed_lines)
+    assert len(records) == 1
+    assert [payload["level"] for payload in records[0]] == ["info", "info", "success", "info", "error"]
+    app.jobs.shutdown()
+
+
+def test_tui_feed_log_written_by_listener(monkeypatch, tmp_path):
+    from codeclaw.tui import app as app_module
+
+    app, _cfg = _build_app(monkeypatch, tmp_path, source="auto")
+    app.emit_feed("listener check", level="warning")
+    app_module._stop_log_listener()
+    log_path = app_module._LOG_LISTENER.handlers[0].baseFilename
+    with open(log_path, encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    assert {"level": "warning", "message": "listener check"}.items() <= rows[-1].items()
+    app_module._start_log_listener()
+    app.jobs.shutdown()
+
+
+def test_tui_feed_payloads_encoded_once_per_record(monkeypatch, tmp_path):
+    import logging
+
+    from codeclaw.tui import app as app_module
+
+    calls = []
+    real_dumps = json.dumps
+    monkeypatch.setattr(app_module.json, "dumps", lambda obj, **kw: calls.append(obj) or real_dumps(obj, **kw))
+    handler = logging.handlers.RotatingFileHandler(tmp_path / "tui.log", maxBytes=1024, encoding="utf-8")
+    handler.setFormatter(app_module._FeedPayloadFormatter("%(message)s"))
+    record = logging.LogRecord("codeclaw.tui", logging.INFO, __file__, 0, "", None, None)
+    record.payload = [{"message": "a"}, {"message": "b"}]
+    handler.handle(record)
+    handler.close()
+    assert len(calls) == 2
+    assert (tmp_path / "tui.log").read_text(encoding="utf-8") == '{"message": "a"}\n{"message": "b"}\n'
+
+
+def test_tui_watch_probe_skips_full_daemon_status(monkeypatch, tmp_path):
+    app, cfg = _build_app(monkeypatch, tmp_path, source="auto")
+    monkeypatch.setattr("codeclaw.tui.app.daemon_status", lambda: pytest.fail("full status probed"))
+    monkeypatch.setattr("codeclaw.tui.app.daemon_running", lambda: True)
+    cfg["watch_paused"] = True
+    app._config_cache = None
+
+    app._probe_watch_state()
+    assert app._runtime_mode() == "paused"
+    app.jobs.shutdown()
+
+
+def test_job_output_tail_keeps_last_chars():
+    from codeclaw.tui.app import _OutputTail
+
+    short = _OutputTail(50)
+    print("hello", file=short)
+    assert short.getvalue() == "hello\n"
+
+    tail = _OutputTail(50)
+    for i in range(100):
+        print(f"line {i}", file=tail)
+    value = tail.getvalue()
+    assert len(value) == 50
+    assert value.startswith(_OutputTail.NOTICE)
+    assert value.endswith("line 98\nline 99\n")
+    assert len(tail._chunks) < 30
+
+
+def test_tui_job_result_output_keeps_tail(monkeypatch, tmp_path):
+    app, _cfg = _build_app(monkeypatch, tmp_path)
+    app.JOB_OUTPUT_MAX_CHARS = 50
+    stdout = "".join(f"line {i}\n" for i in range(100))
+    events = [JobEvent(job_id="j1", kind="success", message="completed", payload={"result": {"stdout": stdout}})]
+    monkeypatch.setattr(app.jobs, "poll_events", lambda: events)
+
+    app._drain_job_events()
+    shown = app.feed_lines[-1].removeprefix("[info] ")
+    assert shown.startswith("... output truncated ...")
+    assert shown.endswith("line 98\nline 99")
+    assert len(shown) <= 50
+    app.jobs.shutdown()
+
+
+def test_tui_feed_level_prefixes(monkeypatch, tmp_path):
+    app, _cfg = _build_app(monkeypatch, tmp_path, source="auto")
+    app._cmd_clear(None, [])
+    for level in ("error", "warning", "success", "info", "debug"):
+        app.emit_feed("msg", level=level)
+    assert list(app.feed_lines) == ["[error] msg", "[warn] msg", "[ok] msg", "[info] msg", "[info] msg"]
+    assert app.FEED_PREFIXES is CodeClawTuiApp.FEED_PREFIXES
+    app.jobs.shutdown()
+
+
+def test_tui_export_parser_reused_with_current_source(monkeypatch, tmp_path):
+    app, _cfg = _build_app(monkeypatch, tmp_path, source="codex")
+    submitted = []
+    monkeypatch.setattr(app.jobs, "submit", lambda name, fn: submitted.append(fn) or JobInfo(id="j", name=name, status="queued", created_at=""))
+    namespaces = []
+    monkeypatch.setattr("codeclaw.tui.app._run_export", namespaces.append)
+    parser = app._export_parser
+
+    assert app._cmd_export(None, ["--dry-run"]).ok is True
+    app.source = "claude"
+    assert app._cmd_export(None, ["--source", "both"]).ok is True
+    assert app._cmd_export(None, []).ok is True
+    assert app._cmd_export(None, ["--bogus"]).ok is False
+    assert app._export_parser is parser
+
+    for fn in submitted:
+        fn(JobContext("j", app.jobs, threading.Event()))
+    assert [(ns.source, ns.dry_run) for ns in namespaces] == [("codex", True), ("both", False), ("claude", False)]
+    app.jobs.shutdown()
+
+
+def test_tui_jobs_lists_compact_view(monkeypatch, tmp_path):
+    app, _cfg = _build_app(monkeypatch, tmp_path)
+    jobs = [
+        JobInfo(id="a", name="export", status="running", created_at="t", progress=0.5, message="working"),
+        JobInfo(id="b", name="export", status="error", created_at="t", progress=1.0, error="boom"),
+        JobInfo(id="c", name="export", status="success", created_at="t", progress=1.0),
+    ]
+    monkeypatch.setattr(app.jobs, "list_jobs", lambda: jobs)
+    monkeypatch.setattr(app.jobs, "active_count", lambda: 1)
+    emitted = []
+    monkeypatch.setattr(app, "emit_feed", lambda msg, level="info": emitted.append(msg))
+
+    assert app._cmd_jobs(None, []).ok is True
+    payload = json.loads(emitted[0])
+    assert payload["active"] == 1
+    assert payload["completed"] == 2
+    assert payload["jobs"] == [
+        {"id": "a", "name": "export", "status": "running", "progress": 0.5},
+        {"id": "b", "name": "export", "status": "error", "progress": 1.0, "error": "boom"},
+        {"id": "c", "name": "export", "status": "success", "progress": 1.0},
+    ]
+    app.jobs.shutdown()
+
+
+def test_tui_banner_emitted_as_one_batch(monkeypatch, tmp_path):
+    app, _cfg = _build_app(monkeypatch, tmp_path)
+    app._cmd_clear(None, [])
+    appended = []
+    logged = []
+    real_append = app._append_feed
+    monkeypatch.setattr(app, "_append_feed", lambda lines: appended.append(lines) or real_append(lines))
+    monkeypatch.setattr(app.logger, "info", lambda msg, extra=None: logged.append(extra["payload"]))
+
+    app._show_banner()
+    assert len(appended) == 1
+    assert len(logged) == 1
+    assert len(logged[0]) == len(appended[0]) == len(app.feed_lines)
+    assert app.feed.text == "\n".join(app.feed_lines)
+    app.jobs.shutdown()
+
+
+def test_tui_feed_skips_payload_when_logging_disabled(monkeypatch, tmp_path):
+    import logging
+
+    app, _cfg = _build_app(monkeypatch, tmp_path)
+    modes = []
+    monkeypatch.setattr(app, "_runtime_mode", lambda: modes.append(1) or "tui")
+    previous = app.logger.level
+    app.logger.setLevel(logging.WARNING)
+    try:
+        app.emit_feed("quiet line")
+    finally:
+        app.logger.setLevel(previous)
+    assert modes == []
+    assert app.feed_lines[-1] == "[info] quiet line"
+    app.jobs.shutdown()
+
+
+def test_tui_handle_input_reports_parse_and_handler_errors(monkeypatch, tmp_path):
+    app, _cfg = _build_app(monkeypatch, tmp_path)
+
+    app.handle_input('/scope "unterminated')
+    assert app.feed_lines[-1].startswith("[error] Command error: ValueError: Command parse error")
+    assert app.last_result == "command error"
+
+    def _boom(_ctx, _args):
+        raise RuntimeError("handler failed")
+
+    monkeypatch.setattr(app.registry.get("status"), "handler", _boom)
+    app.handle_input("/status")
+    assert app.feed_lines[-1] == "[error] Command error: RuntimeError: handler failed"
+    assert app.last_result == "command error"
+
+    app.handle_input("plain text")
+    assert app.feed_lines[-1] == "[info] user> plain text"
+    assert app.last_result == "text accepted"
+    app.jobs.shutdown()
+
+
+def test_tui_handle_input_reports_invalid_handler_result(monkeypatch, tmp_path):
+    app, _cfg = _build_app(monkeypatch, tmp_path)
+    app.registry.register(
+        SlashCommand(name="bad", help_text="Returns nothing", usage="/bad", handler=lambda _ctx, _args: None)
+    )
+
+    app.handle_input("/bad")
+    assert app.feed_lines[-1].startswith("[error] Command error: AttributeError:")
+    assert app.last_result == "command error"
+    app.jobs.shutdown()
+
+
+def test_tui_log_listener_start_stop_tracked_without_internals(monkeypatch):
+    from codeclaw.tui import app as app_module
+
+    calls = []
+
+    class _Listener:
+        def __init__(self, name):
+            self.name = name
+
+        def start(self):
+            calls.append(("start", self.name))
+
+        def stop(self):
+            calls.append(("stop", self.name))
+
+    monkeypatch.setattr(app_module, "_LOG_LISTENER", None)
+    monkeypatch.setattr(app_module, "_LOG_LISTENER_RUNNING", False)
+    app_module._start_log_listener(_Listener("a"))
+    app_module._start_log_listener()
+    app_module._stop_log_listener()
+    app_module._stop_log_listener()
+    app_module._start_log_listener()
+    app_module._start_log_listener(_Listener("b"))
+    app_module._stop_log_listener()
+    assert calls == [("start", "a"), ("stop", "a"), ("start", "a"), ("stop", "a"), ("start", "b"), ("stop", "b")]
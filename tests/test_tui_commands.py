@@ -54,3 +54,64 @@ def test_registry_parse_errors():
     with pytest.raises(ValueError):
         registry.parse('/help "unterminated')
 
+
+def test_registry_help_cache_follows_registration():
+    registry = CommandRegistry()
+    registry.register(SlashCommand(name="watch", aliases=("w",), help_text="watch", usage="/watch", handler=_noop_handler))
+    first = registry.formatted_help()
+    assert first == "Available commands:\n  /watch (aliases: w): watch | usage: /watch"
+    assert registry.formatted_help() is first
+
+    registry.register(SlashCommand(name="help", aliases=(), help_text="show help", handler=_noop_handler))
+    assert registry.command_names() == ["help", "watch"]
+    assert registry.formatted_help().splitlines()[1] == "  /help: show help"
+
+    registry.unregister("w")
+    assert registry.command_names() == ["help"]
+    assert "/watch" not in registry.formatted_help()
+    assert registry.completions("/w") == []
+
+
+@pytest.mark.parametrize("line", [
+    "/watch status",
+    "/config  set  key   value ",
+    "/config set name 'two words'",
+    '/config set name "a \\"quoted\\" word"',
+    "/config set path C:\\\\tmp",
+    "/config\tset\tkey",
+    "/config set key\u00a0value",
+    "/logs #10",
+])
+def test_registry_parse_matches_shlex(line):
+    import shlex
+
+    parsed = CommandRegistry().parse(line)
+    parts = shlex.split(line.strip())
+    assert parsed is not None
+    assert [f"/{parsed.command_name}", *parsed.args] == [parts[0].lower(), *parts[1:]]
+
+
+def test_registry_completion_prefix_range():
+    registry = CommandRegistry()
+    for name in ("export", "exit-now", "ex", "help", "e", "f"):
+        registry.register(SlashCommand(name=name, aliases=(), help_text=name, handler=_noop_handler))
+
+    assert registry.completions("/ex") == ["/ex", "/exit-now", "/export"]
+    assert registry.completions("/EXP") == ["/export"]
+    assert registry.completions("/") == [f"/{name}" for name in registry.command_names()]
+    assert registry.completions("/z") == []
+
+
+def test_registry_unregister_removes_only_own_aliases():
+    registry = CommandRegistry()
+    registry.register(SlashCommand(name="help", aliases=("h", "?"), help_text="h", handler=_noop_handler, source="core"))
+    registry.register(SlashCommand(name="hello", aliases=("hi",), help_text="h", handler=_noop_handler, source="plugin:x"))
+
+    assert registry.unregister_by_source("plugin:x") == 1
+    assert registry.get("hi") is None
+    assert registry.get("h").name == "help"
+
+    assert registry.unregister("?") is True
+    assert registry.get("h") is None
+    registry.register(SlashCommand(name="hello", aliases=("h",), help_text="h", handler=_noop_handler))
+    assert registry.get("h").name == "hello"
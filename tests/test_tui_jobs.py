@@ -1,3 +1,4 @@
+import threading
 import time
 
 from codeclaw.tui.jobs import JobManager
@@ -55,3 +56,211 @@ def test_job_manager_cancel_best_effort():
     assert final.status in {"cancelled", "success"}
     manager.shutdown()
 
+
+def _events_until(manager, kind):
+    kinds = []
+    deadline = time.time() + 3
+    while kind not in kinds and time.time() < deadline:
+        kinds += [event.kind for event in manager.poll_events(timeout=0.5)]
+    return kinds
+
+
+def test_job_manager_poll_events_waits_for_first_event():
+    manager = JobManager(max_workers=1)
+    assert manager.poll_events() == []
+    assert manager.poll_events(timeout=0.01) == []
+
+    release = threading.Event()
+
+    def _task(ctx):
+        release.wait(3)
+        ctx.progress(0.5, "half")
+
+    job = manager.submit("wait", _task)
+    assert "started" in _events_until(manager, "started")
+    release.set()
+    assert _events_until(manager, "success") == ["progress", "success"]
+    assert manager.get_job(job.id).status == "success"
+    manager.shutdown()
+
+
+def test_job_manager_list_jobs_sorted_snapshots():
+    manager = JobManager(max_workers=1)
+    release = threading.Event()
+    first = manager.submit("first", lambda ctx: release.wait(3))
+    second = manager.submit("second", lambda ctx: None)
+
+    listed = manager.list_jobs()
+    assert [job.id for job in listed] == [first.id, second.id]
+    listed[0].status = "mutated"
+    assert manager.get_job(first.id).status != "mutated"
+
+    assert manager.cancel(second.id) is True
+    assert manager.get_job(second.id).status == "cancelled"
+    release.set()
+    assert "success" in _events_until(manager, "success")
+    manager.shutdown()
+
+
+def test_job_manager_updates_job_in_place_and_returns_copies():
+    manager = JobManager(max_workers=1)
+    release = threading.Event()
+
+    def _task(ctx):
+        ctx.progress(0.5, "half")
+        ctx.progress(0.75)
+        release.wait(3)
+
+    job = manager.submit("inplace", _task)
+    assert job.status == "queued"
+    stored = manager._jobs[job.id]
+    _events_until(manager, "progress")
+    deadline = time.time() + 3
+    while manager.get_job(job.id).progress < 0.75 and time.time() < deadline:
+        time.sleep(0.01)
+    assert manager._jobs[job.id] is stored
+    info = manager.get_job(job.id)
+    assert (info.status, info.progress, info.message) == ("running", 0.75, "half")
+    assert info is not stored
+    release.set()
+    _events_until(manager, "success")
+    assert stored.status == "success"
+    assert job.status == "queued"
+    manager.shutdown()
+
+
+def test_job_event_created_at_formatted_from_ns():
+    from datetime import datetime
+
+    from codeclaw.tui.types import JobEvent
+
+    event = JobEvent(job_id="j", kind="progress", created_at_ns=1_700_000_000_250_000_000)
+    assert event.created_at == "2023-11-14T22:13:20.250000+00:00"
+    assert datetime.fromisoformat(JobEvent(job_id="j", kind="queued").created_at).tzinfo is not None
+
+
+def test_job_manager_coalesces_rapid_progress_events():
+    manager = JobManager(max_workers=1)
+    manager.PROGRESS_EVENT_INTERVAL_NS = 10**12
+
+    def _task(ctx):
+        for i in range(1000):
+            ctx.progress(0.1 + i / 1_000_000, "scanning")
+        ctx.progress(0.5, "scanning")
+        ctx.progress(0.5, "writing")
+        ctx.progress(1.0, "writing")
+
+    job = manager.submit("busy", _task)
+    kinds = []
+    progress = []
+    deadline = time.time() + 3
+    while "success" not in kinds and time.time() < deadline:
+        for event in manager.poll_events(timeout=0.5):
+            kinds.append(event.kind)
+            if event.kind == "progress":
+                progress.append((event.progress, event.message))
+    assert progress == [(0.1, "scanning"), (0.5, "scanning"), (0.5, "writing"), (1.0, "writing")]
+    assert manager.get_job(job.id).progress == 1.0
+    manager.shutdown()
+
+
+def test_job_manager_poll_drains_all_jobs_in_order():
+    manager = JobManager(max_workers=2)
+    jobs = [manager.submit(f"job-{i}", lambda ctx: ctx.progress(0.5, "half")) for i in range(4)]
+    seen = []
+    deadline = time.time() + 3
+    while sum(event.kind == "success" for event in seen) < len(jobs) and time.time() < deadline:
+        seen += manager.poll_events(timeout=0.5)
+    for job in jobs:
+        kinds = [event.kind for event in seen if event.job_id == job.id]
+        assert kinds == ["queued", "started", "progress", "success"]
+    manager.shutdown()
+
+
+def test_job_snapshot_copies_every_field():
+    from dataclasses import fields
+
+    from codeclaw.tui.jobs import _snapshot
+    from codeclaw.tui.types import JobInfo
+
+    job = JobInfo(
+        id="a", name="n", status="error", created_at="c", started_at="s", finished_at="f",
+        progress=0.5, message="m", error="e", cancel_requested=True,
+    )
+    copied = _snapshot(job)
+    assert copied == job
+    assert copied is not job
+    assert {item.name for item in fields(JobInfo)} == set(JobInfo.__slots__)
+
+
+def test_job_manager_cancel_queued_and_running_jobs():
+    manager = JobManager(max_workers=1)
+    started = threading.Event()
+
+    def _running(ctx):
+        started.set()
+        while not ctx.cancelled:
+            time.sleep(0.005)
+
+    running = manager.submit("running", _running)
+    queued = manager.submit("queued", lambda ctx: None)
+    assert started.wait(3)
+
+    assert manager.cancel(queued.id) is True
+    assert manager.cancel(queued.id) is False
+    info = manager.get_job(queued.id)
+    assert (info.status, info.message, info.cancel_requested) == ("cancelled", "cancelled before start", True)
+
+    assert manager.cancel(running.id) is True
+    assert manager.get_job(running.id).cancel_requested is True
+    _events_until(manager, "cancelled")
+    deadline = time.time() + 3
+    while manager.get_job(running.id).status == "running" and time.time() < deadline:
+        time.sleep(0.01)
+    assert manager.get_job(running.id).status == "cancelled"
+    assert manager.cancel(running.id) is False
+    manager.shutdown()
+
+
+def test_job_manager_error_text_shared_by_job_and_event():
+    manager = JobManager(max_workers=1)
+
+    def _task(ctx):
+        raise RuntimeError("boom")
+
+    job = manager.submit("fails", _task)
+    deadline = time.time() + 3
+    error_events = []
+    while not error_events and time.time() < deadline:
+        error_events = [event for event in manager.poll_events(timeout=0.5) if event.kind == "error"]
+    info = manager.get_job(job.id)
+    assert info.status == "error"
+    assert info.error == error_events[0].message == "RuntimeError: boom"
+    assert not hasattr(error_events[0], "__dict__")
+    manager.shutdown()
+
+
+def test_job_manager_releases_finished_job_handles():
+    manager = JobManager(max_workers=1)
+    manager.MAX_JOBS = 3
+    release = threading.Event()
+    blocker = manager.submit("blocker", lambda ctx: release.wait(3))
+    queued = manager.submit("queued", lambda ctx: None)
+    assert manager.cancel(queued.id) is True
+    assert queued.id not in manager._futures
+    assert queued.id not in manager._cancel_events
+
+    release.set()
+    _events_until(manager, "success")
+    deadline = time.time() + 3
+    while manager._futures and time.time() < deadline:
+        time.sleep(0.01)
+    assert manager._futures == {}
+    assert manager._cancel_events == {}
+    assert manager._last_progress == {}
+
+    later = [manager.submit(f"later-{i}", lambda ctx: None) for i in range(2)]
+    assert blocker.id not in manager._jobs
+    assert list(manager._jobs) == [queued.id] + [job.id for job in later]
+    assert manager.cancel(blocker.id) is False
+    manager.shutdown()
@@ -1,5 +1,8 @@
+import json
 import textwrap
 
+import pytest
+
 from codeclaw.tui.commands import CommandRegistry
 from codeclaw.tui.plugins import PluginManager
 from codeclaw.tui.types import CommandResult
@@ -125,3 +128,219 @@ def test_plugin_manager_enable_disable_uses_case_insensitive_names(tmp_path, mon
     assert manager.enable("ECHO") is True
     assert "echo" not in cfg["disabled_plugins"]
     assert registry.get("echo") is not None
+
+
+def test_plugin_manager_indexes_normalized_names(tmp_path, monkeypatch):
+    for directory, name in (("one", "Alpha"), ("two", "ALPHA"), ("three", "Beta")):
+        plugin_root = tmp_path / "plugins" / directory
+        plugin_root.mkdir(parents=True, exist_ok=True)
+        (plugin_root / "plugin.json").write_text(
+            f'{{"name":"{name}","version":"0.1.0","entrypoint":"plugin.py"}}',
+            encoding="utf-8",
+        )
+        (plugin_root / "plugin.py").write_text("def register(ctx):\n    pass\n", encoding="utf-8")
+
+    monkeypatch.setattr("codeclaw.tui.plugins.load_config", lambda: {"disabled_plugins": []})
+    monkeypatch.setattr("codeclaw.tui.plugins.save_config", lambda _cfg: None)
+    events, emit = _emit_collector()
+    manager = PluginManager(registry=CommandRegistry(), emit=emit, plugin_dirs=[tmp_path / "plugins"])
+    manager.reload()
+
+    assert manager._find_record("alpha").name == "Alpha"
+    assert manager._find_record(" beta ").loaded is True
+    assert manager._find_record("missing") is None
+    assert manager.records["two"].error == "ValueError: Duplicate plugin name detected: ALPHA"
+    assert manager._find_record("two") is manager.records["two"]
+
+
+def test_plugin_manager_reads_disabled_plugins_once_per_config_change(tmp_config, monkeypatch):
+    config_file = tmp_config
+    config_file.parent.mkdir(parents=True)
+    config_file.write_text("{}", encoding="utf-8")
+    cfg = {"disabled_plugins": ["Echo"]}
+    loads = []
+
+    def _load():
+        loads.append(1)
+        return dict(cfg)
+
+    def _save(new_cfg):
+        cfg.clear()
+        cfg.update(new_cfg)
+        config_file.write_text(json.dumps(new_cfg), encoding="utf-8")
+
+    monkeypatch.setattr("codeclaw.tui.plugins.load_config", _load)
+    monkeypatch.setattr("codeclaw.tui.plugins.save_config", _save)
+    _events, emit = _emit_collector()
+    manager = PluginManager(registry=CommandRegistry(), emit=emit, plugin_dirs=[])
+
+    assert manager._disabled_plugins() == {"echo"}
+    assert manager._disabled_plugins() == {"echo"}
+    assert len(loads) == 1
+
+    manager.enable("echo")
+    assert len(loads) == 2
+    assert manager._disabled_plugins() == set()
+    assert len(loads) == 2
+
+    config_file.write_text('{"disabled_plugins": ["other"]}', encoding="utf-8")
+    cfg["disabled_plugins"] = ["other"]
+    assert manager._disabled_plugins() == {"other"}
+    assert len(loads) == 3
+
+
+def test_plugin_manager_toggle_reloads_only_changed_plugins(tmp_path, monkeypatch):
+    for name in ("alpha", "beta"):
+        plugin_root = tmp_path / "plugins" / name
+        plugin_root.mkdir(parents=True, exist_ok=True)
+        (plugin_root / "plugin.json").write_text(
+            f'{{"name":"{name}","version":"0.1.0","entrypoint":"plugin.py"}}',
+            encoding="utf-8",
+        )
+        (plugin_root / "plugin.py").write_text(
+            textwrap.dedent(
+                f"""
+                from codeclaw.tui.types import CommandResult
+
+                def register(ctx):
+                    ctx.register_command("{name}", lambda _app, _args: CommandResult(ok=True), "{name}")
+                """
+            ),
+            encoding="utf-8",
+        )
+
+    cfg = {"disabled_plugins": []}
+    monkeypatch.setattr("codeclaw.tui.plugins.load_config", lambda: dict(cfg))
+    monkeypatch.setattr("codeclaw.tui.plugins.save_config", lambda new_cfg: cfg.update(new_cfg))
+    registry = CommandRegistry()
+    events, emit = _emit_collector()
+    manager = PluginManager(registry=registry, emit=emit, plugin_dirs=[tmp_path / "plugins"])
+    manager.reload()
+    alpha_module = manager._modules["alpha"]
+
+    def _loaded():
+        names = [message.split("'")[1] for _, message in events if message.startswith("Loaded plugin")]
+        events.clear()
+        return names
+
+    assert _loaded() == ["alpha", "beta"]
+    assert manager.disable("beta") is True
+    assert _loaded() == []
+    assert registry.get("alpha") is not None
+    assert registry.get("beta") is None
+    assert manager._modules["alpha"] is alpha_module
+
+    assert manager.enable("beta") is True
+    assert _loaded() == ["beta"]
+    assert registry.get("beta") is not None
+
+    (tmp_path / "plugins" / "alpha" / "plugin.py").write_text(
+        "def register(ctx):\n    pass\n# changed\n", encoding="utf-8"
+    )
+    manager.disable("beta")
+    assert _loaded() == ["alpha"]
+    assert registry.get("alpha") is None
+
+    manager.reload()
+    assert _loaded() == ["alpha"]
+
+
+def test_plugin_manager_discovers_manifests_in_sorted_order(tmp_path):
+    root = tmp_path / "plugins"
+    for name in ("b", "a", "no-manifest"):
+        (root / name).mkdir(parents=True)
+    (root / "a" / "plugin.json").write_text("{}", encoding="utf-8")
+    (root / "b" / "plugin.json").write_text("{}", encoding="utf-8")
+    (root / "plugin.json").write_text("{}", encoding="utf-8")
+    (root / "file-not-dir").write_text("", encoding="utf-8")
+
+    _events, emit = _emit_collector()
+    manager = PluginManager(
+        registry=CommandRegistry(),
+        emit=emit,
+        plugin_dirs=[root, tmp_path / "missing", root / "file-not-dir"],
+    )
+    assert manager._iter_plugin_manifests() == [root / "a" / "plugin.json", root / "b" / "plugin.json"]
+
+
+def test_plugin_manager_imports_plugins_concurrently_registers_in_order(tmp_path, monkeypatch):
+    import threading
+
+    threads = set()
+    for name in ("gamma", "alpha", "beta", "broken", "off"):
+        plugin_root = tmp_path / "plugins" / name
+        plugin_root.mkdir(parents=True, exist_ok=True)
+        (plugin_root / "plugin.json").write_text(
+            f'{{"name":"{name}","version":"0.1.0","entrypoint":"plugin.py"}}',
+            encoding="utf-8",
+        )
+        body = "raise ImportError('nope')\n" if name == "broken" else "def register(ctx):\n    pass\n"
+        (plugin_root / "plugin.py").write_text(body, encoding="utf-8")
+
+    monkeypatch.setattr("codeclaw.tui.plugins.load_config", lambda: {"disabled_plugins": ["off"]})
+    monkeypatch.setattr("codeclaw.tui.plugins.save_config", lambda _cfg: None)
+    events, emit = _emit_collector()
+    manager = PluginManager(registry=CommandRegistry(), emit=emit, plugin_dirs=[tmp_path / "plugins"])
+    real_load = manager._load_module
+
+    def _load_module(plugin_name, entrypoint):
+        threads.add(threading.current_thread().name)
+        return real_load(plugin_name, entrypoint)
+
+    monkeypatch.setattr(manager, "_load_module", _load_module)
+    records = {record.name: record for record in manager.reload()}
+
+    assert all(name.startswith("codeclaw-plugins") for name in threads)
+    assert [message.split("'")[1] for _, message in events if message.startswith("Loaded plugin")] == [
+        "alpha", "beta", "gamma",
+    ]
+    assert records["broken"].error == "ImportError: nope"
+    assert records["off"].loaded is False and records["off"].error is None
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_plugin_manifest_parsed_from_bytes(tmp_path, monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr("codeclaw.source_adapters.orjson", None)
+    manifest = tmp_path / "plugin.json"
+    manifest.write_text('{"name": "Zoë", "version": "1.0", "note": NaN}', encoding="utf-8")
+    _events, emit = _emit_collector()
+    manager = PluginManager(registry=CommandRegistry(), emit=emit, plugin_dirs=[])
+    assert manager._load_manifest(manifest) == {
+        "name": "Zoë", "version": "1.0", "entrypoint": "plugin.py", "description": "",
+    }
+
+    manifest.write_text("[1, 2]", encoding="utf-8")
+    with pytest.raises(ValueError, match="JSON object"):
+        manager._load_manifest(manifest)
+    manifest.write_text("{broken", encoding="utf-8")
+    with pytest.raises(json.JSONDecodeError):
+        manager._load_manifest(manifest)
+
+
+def test_plugin_record_commands_deduplicated_in_order(tmp_path, monkeypatch):
+    plugin_root = tmp_path / "plugins" / "many"
+    plugin_root.mkdir(parents=True, exist_ok=True)
+    (plugin_root / "plugin.json").write_text('{"name":"many","version":"0.1.0"}', encoding="utf-8")
+    (plugin_root / "plugin.py").write_text(
+        textwrap.dedent(
+            """
+            from codeclaw.tui.types import CommandResult
+
+            def register(ctx):
+                for name in ("b", "a", "c"):
+                    ctx.register_command(name, lambda _app, _args: CommandResult(ok=True), name)
+            """
+        ),
+        encoding="utf-8",
+    )
+    monkeypatch.setattr("codeclaw.tui.plugins.load_config", lambda: {"disabled_plugins": []})
+    monkeypatch.setattr("codeclaw.tui.plugins.save_config", lambda _cfg: None)
+    _events, emit = _emit_collector()
+    manager = PluginManager(registry=CommandRegistry(), emit=emit, plugin_dirs=[tmp_path / "plugins"])
+    (record,) = manager.reload()
+    manager._register_plugin_command("many", "a")
+    manager._register_plugin_command("many", "d")
+    manager._register_plugin_command("missing", "x")
+    assert record.registered_commands == ["b", "a", "c", "d"]
+    assert "_registered_set" not in repr(record)